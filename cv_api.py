@@ -4,398 +4,606 @@ API Flask pour générer des CV à partir de CSV
 Compatible avec Custom GPT OpenAPI 3.1.0
 """
 
-from flask import Flask, request, jsonify, send_file, url_for
+from flask import Flask, Response, request, jsonify, send_file, url_for, make_response
+from werkzeug.exceptions import HTTPException
 from werkzeug.utils import secure_filename
+from werkzeug.wsgi import wrap_file
+import cProfile
+import functools
+import gc
+import hmac
+import marshal
 import os
-import csv
+import pstats
+import sys
 import uuid
+import time
+import threading
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from collections import defaultdict
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.units import cm
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Frame, PageTemplate, FrameBreak
-from reportlab.lib.enums import TA_CENTER
 import io
 import base64
+from cv_model import FORMATION_FIELDS, LIST_SECTIONS, CVData, Header, parse_csv, parse_json
+from cv_cache import cache_key, cv_id_for_key, sweep_folder, SingleFlight
+from cv_storage import DiskBlobStore, MemoryBlobStore
+from cv_jobs import JobQueue, QueueFull
+from cv_executor import InlineExecutor, ProcessPoolRenderExecutor, RenderTimeout
+import cv_metrics
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max
 app.config['UPLOAD_FOLDER'] = '/tmp/cv_uploads'
 app.config['OUTPUT_FOLDER'] = '/tmp/cv_outputs'
 
+# Cache des PDF générés (adressé par contenu)
+app.config['CACHE_ENABLED'] = os.environ.get('CV_CACHE_ENABLED', '1') != '0'
+app.config['CACHE_MAX_BYTES'] = int(os.environ.get('CV_CACHE_MAX_BYTES', 512 * 1024 * 1024))  # 512MB
+app.config['CACHE_MAX_AGE'] = int(os.environ.get('CV_CACHE_MAX_AGE', 24 * 3600))  # 24h
+app.config['CACHE_SWEEP_INTERVAL'] = int(os.environ.get('CV_CACHE_SWEEP_INTERVAL', 60))  # secondes, purge en arrière-plan
+
+# Mode asynchrone (opt-in) : pool de rendu borné et taille maximale de la file
+app.config['JOB_WORKERS'] = int(os.environ.get('CV_JOB_WORKERS', 2))
+app.config['JOB_QUEUE_MAX'] = int(os.environ.get('CV_JOB_QUEUE_MAX', 16))
+app.config['JOB_FOLDER'] = os.path.join(app.config['OUTPUT_FOLDER'], 'jobs')
+
+# Stockage des PDF : 'disk' (OUTPUT_FOLDER) ou 'memory' (LRU en mémoire, par worker)
+app.config['STORAGE_BACKEND'] = os.environ.get('CV_STORAGE_BACKEND', 'disk')
+app.config['MEMORY_STORE_MAX_BYTES'] = int(os.environ.get('CV_MEMORY_STORE_MAX_BYTES', 256 * 1024 * 1024))  # 256MB
+
+# Génération par lot : nombre maximal de CSV par requête
+app.config['BATCH_MAX_ITEMS'] = int(os.environ.get('CV_BATCH_MAX_ITEMS', 500))
+
+# Backend de rendu : 'inline' (dans le worker web) ou 'process' (pool de processus)
+app.config['RENDER_BACKEND'] = os.environ.get('CV_RENDER_BACKEND', 'inline')
+app.config['RENDER_PROCESSES'] = int(os.environ.get('CV_RENDER_PROCESSES', os.cpu_count() or 1))
+app.config['RENDER_TIMEOUT'] = int(os.environ.get('CV_RENDER_TIMEOUT', 60))  # secondes
+
+# En-tête Server-Timing (durée des étapes) sur /generate-cv
+app.config['SERVER_TIMING'] = os.environ.get('CV_SERVER_TIMING', '0') == '1'
+
+# Préchauffage à l'import (rendu d'un CV type) : à combiner avec gunicorn --preload
+app.config['WARMUP'] = os.environ.get('CV_WARMUP', '0') == '1'
+
+# Rendu incrémental (champ session_id) : nombre de sessions gardées en mémoire par worker
+app.config['SESSION_CACHE_MAX'] = int(os.environ.get('CV_SESSION_CACHE_MAX', 256))
+
+# Jeton d'administration (en-tête X-Admin-Token) : active le profilage des rendus
+app.config['ADMIN_TOKEN'] = os.environ.get('CV_ADMIN_TOKEN')
+
+# Mode de réponse 'inline' (PDF dans la réponse) : taille maximale, au-delà l'URL de téléchargement est retournée
+app.config['INLINE_MAX_BYTES'] = int(os.environ.get('CV_INLINE_MAX_BYTES', 2 * 1024 * 1024))  # 2MB
+
 # Créer les dossiers s'ils n'existent pas
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['OUTPUT_FOLDER'], exist_ok=True)
 
-# Configuration des couleurs
-DARK_BLUE = colors.HexColor('#1e3a5f')
-ACCENT_BLUE = colors.HexColor('#2980b9')
-TEXT_GRAY = colors.HexColor('#333333')
+_sweeper_pid = None
+_sweep_lock = threading.Lock()
+_render_pool_pid = None
+_render_pool_lock = threading.Lock()
+_output_folder_bytes = None  # mesurée à chaque purge
+_startup_report = None  # durées du préchauffage (ms)
+_sessions = OrderedDict()  # (session_id, thème) -> StoryCache, éviction LRU
+_sessions_lock = threading.Lock()
 
-PAGE_WIDTH, PAGE_HEIGHT = A4
-LEFT_COLUMN_WIDTH = 7*cm
-MARGIN = 1.5*cm
+job_queue = JobQueue(
+    app.config['JOB_FOLDER'],
+    max_workers=app.config['JOB_WORKERS'],
+    max_pending=app.config['JOB_QUEUE_MAX']
+)
 
 
-def create_styles():
-    """Crée tous les styles nécessaires pour le CV"""
-    styles = getSampleStyleSheet()
-    
-    # Styles sidebar
-    styles.add(ParagraphStyle(
-        name='SidebarName',
-        parent=styles['Normal'],
-        fontSize=18,
-        textColor=colors.white,
-        spaceAfter=4,
-        fontName='Helvetica-Bold',
-        alignment=TA_CENTER
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='SidebarTitle',
-        parent=styles['Normal'],
-        fontSize=13,
-        textColor=colors.HexColor('#ecf0f1'),
-        spaceAfter=12,
-        fontName='Helvetica',
-        alignment=TA_CENTER
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='SidebarSection',
-        parent=styles['Normal'],
-        fontSize=11,
-        textColor=colors.white,
-        spaceBefore=10,
-        spaceAfter=6,
-        fontName='Helvetica-Bold',
-        leftIndent=5
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='SidebarText',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=colors.HexColor('#ecf0f1'),
-        spaceAfter=4,
-        leading=11,
-        fontName='Helvetica',
-        leftIndent=5
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='SidebarBullet',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=colors.HexColor('#ecf0f1'),
-        spaceAfter=3,
-        leading=11,
-        fontName='Helvetica',
-        leftIndent=10,
-        bulletIndent=5
-    ))
-    
-    # Styles main content
-    styles.add(ParagraphStyle(
-        name='MainSection',
-        parent=styles['Heading2'],
-        fontSize=13,
-        textColor=DARK_BLUE,
-        spaceBefore=10,
-        spaceAfter=6,
-        fontName='Helvetica-Bold'
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='JobTitle',
-        parent=styles['Normal'],
-        fontSize=10.5,
-        textColor=DARK_BLUE,
-        spaceBefore=5,
-        spaceAfter=2,
-        fontName='Helvetica-Bold'
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='CompanyDate',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=colors.HexColor('#666666'),
-        spaceAfter=3,
-        fontName='Helvetica-Oblique'
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='MainText',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=TEXT_GRAY,
-        spaceAfter=3,
-        leading=11,
-        fontName='Helvetica'
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='MainBullet',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=TEXT_GRAY,
-        leftIndent=12,
-        spaceAfter=2,
-        leading=11,
-        fontName='Helvetica'
-    ))
+def parse_csv_content(csv_content):
+    """
+    Parse le contenu CSV (chaîne ou flux texte) en un modèle CVData
     
-    return styles
+    Les lignes sont lues une à une : la mémoire utilisée dépend de la taille
+    d'une ligne et non de celle du document.
+    """
+    with cv_metrics.timed('parse'):
+        return parse_csv(csv_content)
 
 
-def parse_csv_content(csv_content):
-    """Parse le contenu CSV"""
-    data = defaultdict(lambda: defaultdict(list))
-    
-    csv_reader = csv.DictReader(io.StringIO(csv_content))
-    for row in csv_reader:
-        if row['section'].startswith('#') or not row['section'].strip():
-            continue
-        
-        section = row['section'].strip()
-        subsection = row['subsection'].strip()
-        content_type = row['type'].strip()
-        content = row['content'].strip()
-        order = int(row['order']) if row['order'].strip() else 0
-        
-        data[section][subsection].append({
-            'type': content_type,
-            'content': content,
-            'order': order
-        })
-    
-    # Trier par ordre
-    for section in data:
-        for subsection in data[section]:
-            data[section][subsection].sort(key=lambda x: x['order'])
-    
-    return data
+def parse_cv_json(document):
+    """Valide un CV structuré (champ 'cv' du JSON) et le convertit en CVData, sans passer par le CSV"""
+    with cv_metrics.timed('parse'):
+        return parse_json(document)
 
 
-def build_sidebar(data, styles):
-    """Construit le contenu de la colonne latérale"""
-    story = []
-    
-    story.append(Spacer(1, 1*cm))
-    if 'header' in data:
-        if 'nom' in data['header']:
-            nom = data['header']['nom'][0]['content']
-            story.append(Paragraph(nom, styles['SidebarName']))
-        
-        if 'titre' in data['header']:
-            titre = data['header']['titre'][0]['content']
-            story.append(Paragraph(titre, styles['SidebarTitle']))
-    
-    story.append(Spacer(1, 0.5*cm))
-    
-    # Contact
-    story.append(Paragraph("📧 Contact", styles['SidebarSection']))
-    if 'header' in data:
-        for key in ['email', 'telephone', 'localisation', 'remote']:
-            if key in data['header']:
-                content = data['header'][key][0]['content']
-                story.append(Paragraph(content, styles['SidebarText']))
-    story.append(Spacer(1, 0.3*cm))
-    
-    # Réseaux sociaux
-    if 'header' in data and ('twitter' in data['header'] or 'linkedin' in data['header']):
-        story.append(Paragraph("🌐 Réseaux sociaux", styles['SidebarSection']))
-        for key in ['twitter', 'linkedin']:
-            if key in data['header']:
-                content = data['header'][key][0]['content']
-                story.append(Paragraph(content, styles['SidebarText']))
-        story.append(Spacer(1, 0.3*cm))
-    
-    # Langues
-    if 'langues' in data:
-        story.append(Paragraph("🌍 Langues", styles['SidebarSection']))
-        for lang_key in sorted(data['langues'].keys()):
-            for item in data['langues'][lang_key]:
-                story.append(Paragraph(item['content'], styles['SidebarText']))
-        story.append(Spacer(1, 0.3*cm))
-    
-    # Compétences clés
-    if 'competences_cles' in data:
-        story.append(Paragraph("💡 Compétences clés", styles['SidebarSection']))
-        for comp_key in sorted(data['competences_cles'].keys()):
-            for item in data['competences_cles'][comp_key]:
-                story.append(Paragraph(f"• {item['content']}", styles['SidebarBullet']))
-                story.append(Spacer(1, 0.2*cm))
-        story.append(Spacer(1, 0.3*cm))
-    
-    # Centres d'intérêt
-    if 'centres_interet' in data:
-        story.append(Paragraph("🎨 Centres d'intérêt", styles['SidebarSection']))
-        for interet_key in sorted(data['centres_interet'].keys()):
-            for item in data['centres_interet'][interet_key]:
-                story.append(Paragraph(item['content'], styles['SidebarText']))
-    
-    return story
+def render_cv(data, theme='default', session_id=None):
+    """
+    Génère le CV PDF (bytes) à partir des données parsées, via l'exécuteur de rendu configuré
 
+    Avec un session_id (backend 'inline'), les blocs inchangés depuis le rendu
+    précédent de la session sont réutilisés.
+    """
+    story_cache = session_story_cache(session_id, theme) if session_id else None
+    if story_cache is not None:
+        timings = {}
+        with story_cache.lock:
+            pdf_bytes = story_cache.render_bytes(data, timings)
+    else:
+        pdf_bytes, timings = render_executor.run(build_pdf, data, theme)
+    cv_metrics.observe_all(timings)
+    return pdf_bytes
 
-def build_main_content(data, styles):
-    """Construit le contenu principal"""
-    story = []
-    
-    story.append(Spacer(1, 0.5*cm))
-    
-    # Profil
-    if 'profil' in data:
-        story.append(Paragraph("PROFIL", styles['MainSection']))
-        if 'description' in data['profil']:
-            profil_text = data['profil']['description'][0]['content']
-            story.append(Paragraph(profil_text, styles['MainText']))
-        story.append(Spacer(1, 0.3*cm))
-    
-    # Expériences professionnelles
-    if 'experience' in data:
-        story.append(Paragraph("EXPÉRIENCES PROFESSIONNELLES", styles['MainSection']))
-        
-        experiences = defaultdict(dict)
-        for key in data['experience']:
-            if '_' in key:
-                prefix, suffix = key.split('_', 1)
-                if suffix not in experiences[prefix]:
-                    experiences[prefix][suffix] = []
-                experiences[prefix][suffix].extend(data['experience'][key])
-        
-        sorted_experiences = []
-        for prefix in experiences:
-            if 'titre' in experiences[prefix]:
-                order = experiences[prefix]['titre'][0]['order']
-                sorted_experiences.append((order, prefix, experiences[prefix]))
-        
-        sorted_experiences.sort(key=lambda x: x[0])
-        
-        for _, prefix, exp_data in sorted_experiences:
-            if 'titre' in exp_data:
-                titre = exp_data['titre'][0]['content']
-                story.append(Paragraph(titre, styles['JobTitle']))
-            
-            if 'periode' in exp_data:
-                periode = exp_data['periode'][0]['content']
-                story.append(Paragraph(periode, styles['CompanyDate']))
-            
-            bullets = []
-            for key in exp_data:
-                if key.startswith('bullet'):
-                    bullets.extend(exp_data[key])
-            
-            bullets.sort(key=lambda x: x['order'])
-            for bullet in bullets:
-                story.append(Paragraph(f"• {bullet['content']}", styles['MainBullet']))
-            
-            story.append(Spacer(1, 0.2*cm))
-    
-    # Formations
-    if 'formation' in data:
-        story.append(Paragraph("DIPLÔMES ET FORMATIONS", styles['MainSection']))
-        
-        formations = defaultdict(dict)
-        for key in data['formation']:
-            if '_' in key:
-                prefix, suffix = key.split('_', 1)
-                if suffix not in formations[prefix]:
-                    formations[prefix][suffix] = []
-                formations[prefix][suffix].extend(data['formation'][key])
-        
-        sorted_formations = []
-        for prefix in formations:
-            if 'titre' in formations[prefix]:
-                order = formations[prefix]['titre'][0]['order']
-                sorted_formations.append((order, prefix, formations[prefix]))
-        
-        sorted_formations.sort(key=lambda x: x[0])
-        
-        for _, prefix, form_data in sorted_formations:
-            if 'titre' in form_data:
-                titre = form_data['titre'][0]['content']
-                story.append(Paragraph(titre, styles['JobTitle']))
-            
-            if 'periode' in form_data:
-                periode = form_data['periode'][0]['content']
-                story.append(Paragraph(periode, styles['CompanyDate']))
-            
-            if 'description' in form_data:
-                description = form_data['description'][0]['content']
-                story.append(Paragraph(description, styles['MainText']))
-            
-            story.append(Spacer(1, 0.15*cm))
-    
-    # Compétences techniques
-    if 'competences_tech' in data:
-        story.append(Paragraph("COMPÉTENCES TECHNIQUES", styles['MainSection']))
-        for comp_key in sorted(data['competences_tech'].keys()):
-            for item in data['competences_tech'][comp_key]:
-                story.append(Paragraph(f"• {item['content']}", styles['MainBullet']))
-        story.append(Spacer(1, 0.2*cm))
-    
-    return story
 
+def session_story_cache(session_id, theme):
+    """
+    Retourne le cache de blocs (StoryCache) d'une session de rendu incrémental
 
-def generate_cv_from_csv(csv_content, output_path):
-    """Génère le CV PDF à partir du contenu CSV"""
-    
-    # Parser les données
-    data = parse_csv_content(csv_content)
-    
-    # Créer les styles
-    styles = create_styles()
-    
-    # Créer le document
-    doc = SimpleDocTemplate(
-        output_path,
-        pagesize=A4,
-        leftMargin=0,
-        rightMargin=0,
-        topMargin=0,
-        bottomMargin=0
-    )
-    
-    # Frames
-    sidebar_frame = Frame(
-        0, 0, LEFT_COLUMN_WIDTH, PAGE_HEIGHT,
-        leftPadding=10, rightPadding=10, topPadding=10, bottomPadding=10,
-        showBoundary=0
-    )
-    
-    main_frame = Frame(
-        LEFT_COLUMN_WIDTH, 0, PAGE_WIDTH - LEFT_COLUMN_WIDTH, PAGE_HEIGHT,
-        leftPadding=MARGIN, rightPadding=MARGIN, topPadding=MARGIN, bottomPadding=MARGIN,
-        showBoundary=0
-    )
-    
-    def on_page(canvas, doc):
-        canvas.saveState()
-        canvas.setFillColor(DARK_BLUE)
-        canvas.rect(0, 0, LEFT_COLUMN_WIDTH, PAGE_HEIGHT, fill=1, stroke=0)
-        canvas.restoreState()
+    Les flowables restent dans le worker web : le rendu incrémental n'est
+    disponible qu'avec le backend 'inline' (None sinon).
+    """
+    if app.config['RENDER_BACKEND'] != 'inline':
+        return None
+    key = (session_id, theme)
+    with _sessions_lock:
+        story_cache = _sessions.get(key)
+        if story_cache is None:
+            story_cache = _sessions[key] = engine().StoryCache(theme)
+            while len(_sessions) > app.config['SESSION_CACHE_MAX']:
+                _sessions.popitem(last=False)
+        else:
+            _sessions.move_to_end(key)
+        return story_cache
+
+
+def engine():
+    """
+    Retourne le moteur de rendu, importé à la demande
+
+    ReportLab n'est ainsi chargé qu'au premier rendu : /health et /openapi.json
+    n'en paient pas le coût au démarrage.
+    """
+    import cv_engine
+    return cv_engine
+
+
+def paragraph_cache_stats():
+    """Compteurs du cache de paragraphes du processus (None tant que le moteur n'est pas chargé)"""
+    module = sys.modules.get('cv_engine')
+    return module.paragraph_cache.as_dict() if module is not None else None
+
+
+def build_pdf(data, theme='default'):
+    """
+    Construit le PDF en mémoire dans le processus courant
+
+    Retourne (octets du PDF, durées des étapes) : les durées mesurées dans un
+    processus de rendu remontent ainsi au worker web qui les enregistre.
+    """
+    timings = {}
+    pdf_bytes = engine().render_bytes(data, theme, timings)
+    return pdf_bytes, timings
+
+
+def build_pdf_profiled(data, theme='default'):
+    """
+    Comme build_pdf, sous cProfile
+
+    Retourne (octets du PDF, durées des étapes, profil) ; le profil est au
+    format de cProfile.Profile.dump_stats (lisible par pstats, snakeviz...).
+    """
+    profiler = cProfile.Profile()
+    pdf_bytes, timings = profiler.runcall(build_pdf, data, theme)
+    profiler.create_stats()
+    return pdf_bytes, timings, marshal.dumps(profiler.stats)
+
+
+def warm_up():
+    """
+    Préchauffe le processus : import de ReportLab, styles, rendu d'un CV type
+
+    Avec gunicorn --preload, le préchauffage a lieu une seule fois dans le
+    master : les workers forkés partagent en copy-on-write la mémoire déjà
+    chaude (gc.freeze évite que le ramasse-miettes ne la recopie) et leur
+    premier CV est rendu à chaud. Retourne les durées (ms).
+    """
+    global _startup_report
+    started = time.perf_counter()
+    module = engine()
+    report = {'import_engine': time.perf_counter() - started}
+    report.update(module.warm_up())
+    report['total'] = time.perf_counter() - started
+    gc.freeze()
     
-    page_template = PageTemplate(
-        id='TwoColumn',
-        frames=[sidebar_frame, main_frame],
-        onPage=on_page
+    _startup_report = {step: round(seconds * 1000, 1) for step, seconds in report.items()}
+    print(
+        "🔥 Préchauffage: " + ", ".join(f"{step} {ms} ms" for step, ms in _startup_report.items()),
+        file=sys.stderr,
+        flush=True
     )
-    
-    doc.addPageTemplates([page_template])
-    
-    # Construire le contenu
-    story = []
-    story.extend(build_sidebar(data, styles))
-    story.append(FrameBreak())
-    story.extend(build_main_content(data, styles))
-    
-    # Générer le PDF
-    doc.build(story)
+    return _startup_report
+
+
+def init_render_worker():
+    """Initialise un processus de rendu : moteur importé et préchauffé (styles, rendu d'un CV type)"""
+    engine().warm_up()
+
+
+def create_blob_store():
+    """Crée le stockage des PDF correspondant à STORAGE_BACKEND"""
+    backend = app.config['STORAGE_BACKEND']
+    if backend == 'disk':
+        return DiskBlobStore(app.config['OUTPUT_FOLDER'])
+    if backend == 'memory':
+        return MemoryBlobStore(app.config['MEMORY_STORE_MAX_BYTES'])
+    raise ValueError(f"Backend de stockage inconnu: {backend}")
+
+
+def create_render_executor():
+    """Crée l'exécuteur de rendu correspondant à RENDER_BACKEND"""
+    backend = app.config['RENDER_BACKEND']
+    if backend == 'inline':
+        return InlineExecutor()
+    if backend == 'process':
+        return ProcessPoolRenderExecutor(
+            max_workers=app.config['RENDER_PROCESSES'],
+            timeout=app.config['RENDER_TIMEOUT'],
+            initializer=init_render_worker
+        )
+    raise ValueError(f"Backend de rendu inconnu: {backend}")
+
+
+def create_single_flight():
+    """Regroupement des rendus identiques simultanés (entre workers avec le stockage disque)"""
+    lock_folder = None
+    if app.config['STORAGE_BACKEND'] == 'disk':
+        lock_folder = os.path.join(app.config['OUTPUT_FOLDER'], 'locks')
+    return SingleFlight(lock_folder, timeout=app.config['RENDER_TIMEOUT'])
+
+
+def sweep_outputs():
+    """Purge les stockages : PDF (TTL + taille maximale, LRU), états de jobs et uploads (TTL)"""
+    global _output_folder_bytes
+    with _sweep_lock:
+        now = time.time()
+        # Les états de jobs et les uploads ne sont purgés que par âge
+        _, job_bytes = sweep_folder(
+            app.config['JOB_FOLDER'],
+            float('inf'),
+            app.config['CACHE_MAX_AGE'],
+            suffix='.json',
+            now=now
+        )
+        sweep_folder(
+            app.config['UPLOAD_FOLDER'],
+            float('inf'),
+            app.config['CACHE_MAX_AGE'],
+            suffix='',
+            now=now
+        )
+        removed = blob_store.sweep(
+            app.config['CACHE_MAX_BYTES'],
+            app.config['CACHE_MAX_AGE'],
+            now=now
+        )
+        # Le dossier de sortie contient les états de jobs et, sur disque, les PDF :
+        # leurs tailles sont celles conservées par les purges, sans nouveau parcours
+        _output_folder_bytes = job_bytes
+        if app.config['STORAGE_BACKEND'] == 'disk':
+            _output_folder_bytes += blob_store.stats.bytes
+        return removed
+
+
+def _sweep_loop():
+    while True:
+        try:
+            sweep_outputs()
+        except Exception:
+            app.logger.exception("Échec de la purge des stockages")
+        time.sleep(app.config['CACHE_SWEEP_INTERVAL'])
+
+
+@app.before_request
+def start_sweeper():
+    """Démarre le thread de purge périodique (une fois par processus, après le fork des workers)"""
+    global _sweeper_pid
+    if _sweeper_pid == os.getpid():
+        return
+    with _sweep_lock:
+        if _sweeper_pid != os.getpid():
+            _sweeper_pid = os.getpid()
+            threading.Thread(target=_sweep_loop, name='cv-sweeper', daemon=True).start()
+
+
+def _warm_render_pool():
+    try:
+        render_executor.warm()
+    except Exception:
+        app.logger.exception("Échec du préchauffage du pool de rendu")
+
+
+@app.before_request
+def start_render_pool():
+    """
+    Démarre le pool de rendu en arrière-plan (une fois par processus, après le fork des workers)
+
+    Les processus de rendu se préchauffent au démarrage (init_render_worker) :
+    le premier CV d'un worker n'attend ni l'import de ReportLab ni un rendu à froid.
+    """
+    global _render_pool_pid
+    if _render_pool_pid == os.getpid():
+        return
+    with _render_pool_lock:
+        if _render_pool_pid != os.getpid():
+            _render_pool_pid = os.getpid()
+            threading.Thread(target=_warm_render_pool, name='cv-render-warmup', daemon=True).start()
+
+
+def blob_name(cv_id):
+    """Nom du PDF d'un CV dans le stockage"""
+    return f"{cv_id}.pdf"
+
+
+def profile_name(cv_id):
+    """Nom du profil de rendu d'un CV dans le stockage (à côté du PDF)"""
+    return f"{cv_id}.prof"
+
+
+def new_cv_id(data, theme):
+    """Identifiant dérivé du contenu si le cache est actif, sinon unique"""
+    if app.config['CACHE_ENABLED']:
+        return cv_id_for_key(cache_key(data, f"{engine().TEMPLATE_VERSION}:{theme}"))
+    return str(uuid.uuid4())
+
+
+def ensure_cv(data, cv_id, theme, session_id=None):
+    """
+    Génère le CV s'il n'est pas déjà en cache ; retourne True si le cache a servi
+
+    Les requêtes identiques simultanées (ex: relances d'un client) attendent
+    le premier rendu et partagent son PDF au lieu de le refaire.
+    """
+    name = blob_name(cv_id)
+    if not app.config['CACHE_ENABLED']:
+        store_cv(name, render_cv(data, theme, session_id))
+        return False
+    if blob_store.touch(name):
+        return True
+    with single_flight.hold(cv_id) as waited:
+        if waited and blob_store.touch(name):
+            single_flight.incr('coalesced')
+            return True
+        store_cv(name, render_cv(data, theme, session_id))
+    return False
+
+
+def ensure_cv_bytes(data, cv_id, theme, session_id=None):
+    """Comme ensure_cv, mais retourne (contenu du PDF, cached) pour une réponse inline"""
+    name = blob_name(cv_id)
+    if not app.config['CACHE_ENABLED']:
+        pdf_bytes = render_cv(data, theme, session_id)
+        store_cv(name, pdf_bytes)
+        return pdf_bytes, False
+    pdf_bytes = blob_store.get(name)
+    if pdf_bytes is not None:
+        return pdf_bytes, True
+    with single_flight.hold(cv_id) as waited:
+        pdf_bytes = blob_store.get(name) if waited else None
+        if pdf_bytes is not None:
+            single_flight.incr('coalesced')
+            return pdf_bytes, True
+        pdf_bytes = render_cv(data, theme, session_id)
+        store_cv(name, pdf_bytes)
+    return pdf_bytes, False
+
+
+def store_cv(name, pdf_bytes):
+    """Écrit un PDF rendu dans le stockage (étape 'write')"""
+    with cv_metrics.timed('write'):
+        blob_store.put(name, pdf_bytes)
+
+
+def profile_cv(data, cv_id, theme):
+    """Génère le CV sous profilage (cache ignoré) et stocke le PDF et son profil"""
+    pdf_bytes, timings, profile = render_executor.run(build_pdf_profiled, data, theme)
+    cv_metrics.observe_all(timings)
+    with cv_metrics.timed('write'):
+        blob_store.put(blob_name(cv_id), pdf_bytes)
+    blob_store.put(profile_name(cv_id), profile)
+
+
+def render_job(data, cv_id, theme, session_id=None):
+    """Job asynchrone : génère le CV s'il n'existe pas déjà"""
+    ensure_cv(data, cv_id, theme, session_id)
+    return {"cv_id": cv_id}
+
+
+def batch_workers():
+    """Nombre de rendus simultanés pour un lot (parallèle seulement avec le backend 'process')"""
+    if app.config['RENDER_BACKEND'] == 'process':
+        return app.config['RENDER_PROCESSES']
+    return 1
+
+
+def render_batch_item(source, theme):
+    """
+    Génère un CV d'un lot ; retourne (cv_id, cached)
+
+    source : contenu CSV, CV déjà parsé (CVData), ou erreur de parsing à
+    reporter dans le résultat de ce CV
+    """
+    if isinstance(source, Exception):
+        raise source
+    data = source if isinstance(source, CVData) else parse_csv_content(source)
+    cv_id = new_cv_id(data, theme)
+    return cv_id, ensure_cv(data, cv_id, theme)
+
+
+class _ZipStream:
+    """Tampon en écriture seule pour produire une archive ZIP au fil de l'eau"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_batch_zip(futures, names):
+    """Génère l'archive ZIP des CV d'un lot au fur et à mesure des rendus"""
+    buffer = _ZipStream()
+    errors = []
+    try:
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for index, future in enumerate(futures):
+                try:
+                    cv_id, _ = future.result()
+                    pdf_bytes = blob_store.get(blob_name(cv_id))
+                    if pdf_bytes is None:
+                        raise FileNotFoundError("CV évincé du stockage avant l'archivage")
+                    archive.writestr(names[index], pdf_bytes)
+                except Exception as e:
+                    errors.append(f"{names[index]}: {e}")
+                yield buffer.pop()
+            if errors:
+                archive.writestr('errors.txt', '\n'.join(errors) + '\n')
+        yield buffer.pop()
+    finally:
+        # Client déconnecté : les rendus pas encore démarrés sont annulés
+        for future in futures:
+            future.cancel()
+
+
+def with_server_timing(view):
+    """Ajoute l'en-tête Server-Timing (durée des étapes du rendu) si SERVER_TIMING est actif"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        with cv_metrics.collect() as timings:
+            response = make_response(view(*args, **kwargs))
+        if app.config['SERVER_TIMING'] and timings:
+            response.headers['Server-Timing'] = cv_metrics.server_timing(timings)
+        return response
+    return wrapper
+
+
+def stream_blob(blob, etag, mimetype, download_name):
+    """
+    Réponse HTTP transmettant un fichier du stockage par blocs (sans le charger en mémoire)
+
+    Gère les requêtes conditionnelles (If-None-Match -> 304) et partielles
+    (Range -> 206, reprise d'un téléchargement interrompu) à partir de l'ETag
+    et de la taille du fichier.
+    """
+    if isinstance(blob, io.BytesIO):
+        size = blob.getbuffer().nbytes
+    else:
+        size = os.fstat(blob.fileno()).st_size
+    response = Response(wrap_file(request.environ, blob), mimetype=mimetype, direct_passthrough=True)
+    response.headers.set('Content-Disposition', 'attachment', filename=download_name)
+    response.content_length = size
+    response.set_etag(etag)
+    response.accept_ranges = 'bytes'
+    response.cache_control.private = True
+    response.cache_control.max_age = app.config['CACHE_MAX_AGE']
+    try:
+        return response.make_conditional(request, accept_ranges=True, complete_length=size)
+    except HTTPException:
+        # Range hors du fichier (416) : le fichier n'est pas transmis
+        response.close()
+        raise
+
+
+def is_admin_request():
+    """Indique si la requête porte le jeton d'administration (X-Admin-Token)"""
+    token = app.config['ADMIN_TOKEN']
+    supplied = request.headers.get('X-Admin-Token', '')
+    return bool(token) and hmac.compare_digest(supplied.encode('utf-8'), token.encode('utf-8'))
+
+
+def is_profile_request():
+    """Indique si le client demande le profilage du rendu (?profile=1 ou en-tête X-CV-Profile)"""
+    flag = request.args.get('profile', request.headers.get('X-CV-Profile'))
+    return str(flag).lower() in ('1', 'true', 'yes')
+
+
+class _LoadedProfile:
+    """Profil sérialisé rechargé, au format attendu par pstats.Stats"""
+
+    def __init__(self, data):
+        self.stats = marshal.loads(data)
+
+    def create_stats(self):
+        pass
+
+
+def get_session_id(payload):
+    """Identifiant de session de rendu incrémental (champ 'session_id'), ou None"""
+    session_id = payload.get('session_id') if payload is not None else None
+    if session_id is None or session_id == '':
+        return None
+    if not isinstance(session_id, str) or len(session_id) > 128:
+        raise ValueError("Le champ 'session_id' doit être une chaîne de 128 caractères au plus")
+    return session_id
+
+
+def get_response_mode(payload):
+    """Mode de réponse demandé (?response_mode= ou champ 'response_mode') : 'url' ou 'inline'"""
+    mode = request.args.get('response_mode')
+    if mode is None and payload is not None:
+        mode = payload.get('response_mode')
+    if mode is None or mode == '':
+        return 'url'
+    if mode not in ('url', 'inline'):
+        raise ValueError("Le champ 'response_mode' doit valoir 'url' ou 'inline'")
+    return mode
+
+
+def wants_raw_pdf():
+    """Indique si le client préfère recevoir le PDF brut (Accept: application/pdf) plutôt que du JSON"""
+    return request.accept_mimetypes.best_match(['application/json', 'application/pdf']) == 'application/pdf'
+
+
+def inline_pdf_response(pdf_bytes, cv_id, cached, download_url):
+    """Réponse du mode inline : PDF brut ou JSON avec le PDF encodé en base64"""
+    if wants_raw_pdf():
+        response = Response(pdf_bytes, mimetype='application/pdf')
+        response.headers.set('Content-Disposition', 'inline', filename='cv_generated.pdf')
+        response.headers['X-CV-Id'] = cv_id
+        response.headers['X-CV-Cached'] = 'true' if cached else 'false'
+        response.headers['Content-Location'] = download_url
+        response.set_etag(cv_id)
+        return response
+    return jsonify({
+        "success": True,
+        "cv_id": cv_id,
+        "download_url": download_url,
+        "cached": cached,
+        "response_mode": "inline",
+        "content_type": "application/pdf",
+        "size_bytes": len(pdf_bytes),
+        "pdf_base64": base64.b64encode(pdf_bytes).decode('ascii'),
+        "message": "CV généré avec succès"
+    })
+
+
+def is_async_request(payload):
+    """Indique si le client demande le mode asynchrone (?async=1 ou champ 'async')"""
+    flag = request.args.get('async')
+    if flag is None and payload is not None:
+        flag = payload.get('async')
+    return str(flag).lower() in ('1', 'true', 'yes')
+
+
+blob_store = create_blob_store()
+render_executor = create_render_executor()
+single_flight = create_single_flight()
+
+if app.config['WARMUP']:
+    warm_up()
 
 
 @app.route('/health', methods=['GET'])
@@ -403,11 +611,16 @@ def health():
     """Endpoint de santé"""
     return jsonify({
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow().isoformat(),
+        "storage": blob_store.stats.as_dict(),
+        "paragraph_cache": paragraph_cache_stats(),
+        "single_flight": single_flight.as_dict(),
+        "startup": _startup_report
     })
 
 
 @app.route('/generate-cv', methods=['POST'])
+@with_server_timing
 def generate_cv():
     """
     Génère un CV à partir d'un contenu CSV
@@ -417,6 +630,17 @@ def generate_cv():
         "csv_content": "section,subsection,type,content,order\\nheader,nom,text,John Doe,1\\n..."
     }
     
+    Ou (JSON structuré, sans CSV, voir cv_model.parse_json):
+    {
+        "cv": {
+            "header": {"nom": "John Doe", "titre": "..."},
+            "experiences": [{"titre": "...", "periode": "...", "bullets": ["..."]}],
+            "formations": [{"titre": "...", "periode": "..."}],
+            "competences_tech": ["..."]
+        }
+    }
+    Un CV invalide est refusé (400) avec le champ fautif dans le message.
+    
     Ou (multipart/form-data):
     - csv_file: fichier CSV uploadé
     
@@ -425,21 +649,66 @@ def generate_cv():
         "success": true,
         "cv_id": "uuid",
         "download_url": "/download-cv/uuid",
+        "cached": false,
         "message": "CV généré avec succès"
     }
+    
+    Un CSV déjà généré (mêmes données, même version de template) n'est pas
+    re-rendu : l'identifiant du PDF existant est retourné avec "cached": true.
+    
+    Mode asynchrone (?async=1 ou "async": true) : répond 202 avec un job_id
+    et une status_url (/jobs/<job_id>) ; 429 si la file de génération est pleine.
+    
+    Avec CV_SERVER_TIMING=1, la réponse porte un en-tête Server-Timing
+    (decode, parse, styles, story, layout, write ; en millisecondes).
+    
+    Rendu incrémental ("session_id": "..."): les CV successifs d'une même
+    session réutilisent les blocs inchangés (sidebar, profil, chaque
+    expérience...) ; seuls les blocs modifiés et la mise en page sont refaits.
+    
+    Profilage (?profile=1 ou X-CV-Profile: 1, avec X-Admin-Token) : le rendu
+    est refait sous cProfile, cache ignoré ; le profil est ensuite disponible
+    sur /profiles/<cv_id> ("profile_url" dans la réponse).
+    
+    Mode inline (?response_mode=inline ou "response_mode": "inline") : le PDF
+    est retourné directement, sans second appel à /download-cv : encodé en
+    base64 dans le JSON ("pdf_base64"), ou brut si l'en-tête Accept préfère
+    application/pdf. Au-delà de CV_INLINE_MAX_BYTES, la réponse habituelle
+    avec download_url est retournée ("response_mode": "url"). Le mode inline
+    est toujours synchrone.
     """
     try:
         csv_content = None
+        payload = None
+        data = None
+        
+        profile = is_profile_request()
+        if profile and not is_admin_request():
+            return jsonify({
+                "success": False,
+                "error": "Le profilage est réservé aux administrateurs (X-Admin-Token)"
+            }), 403
         
-        # Vérifier si c'est du JSON avec csv_content
+        # Vérifier si c'est du JSON avec csv_content ou un CV structuré
         if request.is_json:
-            data = request.get_json()
-            csv_content = data.get('csv_content')
+            # Pour un upload, le décodage se fait au fil du parsing
+            with cv_metrics.timed('decode'):
+                payload = request.get_json()
+            if payload.get('cv') is not None:
+                try:
+                    data = parse_cv_json(payload['cv'])
+                except ValueError as e:
+                    return jsonify({
+                        "success": False,
+                        "error": f"CV invalide: {e}"
+                    }), 400
+            else:
+                csv_content = payload.get('csv_content')
             
-            if not csv_content:
+            if data is None and not csv_content:
                 return jsonify({
                     "success": False,
-                    "error": "Le champ 'csv_content' est requis"
+                    "error": "Le champ 'csv_content' ou 'cv' est requis"
                 }), 400
         
         # Vérifier si c'est un fichier uploadé
@@ -457,29 +726,225 @@ def generate_cv():
                     "error": "Le fichier doit être un CSV"
                 }), 400
             
-            csv_content = file.read().decode('utf-8')
+            # Lecture en flux : l'upload n'est jamais chargé en entier en mémoire
+            csv_content = io.TextIOWrapper(file.stream, encoding='utf-8', newline='')
+            payload = request.form
         
         else:
             return jsonify({
                 "success": False,
-                "error": "Aucun contenu CSV fourni. Utilisez 'csv_content' (JSON) ou 'csv_file' (multipart)"
+                "error": "Aucun contenu CSV fourni. Utilisez 'csv_content' ou 'cv' (JSON), ou 'csv_file' (multipart)"
             }), 400
         
-        # Générer un ID unique pour ce CV
-        cv_id = str(uuid.uuid4())
-        output_path = os.path.join(app.config['OUTPUT_FOLDER'], f"{cv_id}.pdf")
+        if data is None:
+            try:
+                data = parse_csv_content(csv_content)
+            finally:
+                if isinstance(csv_content, io.TextIOWrapper):
+                    # Le flux de l'upload reste géré (et fermé) par Werkzeug
+                    csv_content.detach()
+        theme = 'default'
+        cv_id = new_cv_id(data, theme)
         
-        # Générer le CV
-        generate_cv_from_csv(csv_content, output_path)
+        try:
+            session_id = get_session_id(payload)
+            inline = get_response_mode(payload) == 'inline'
+        except ValueError as e:
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 400
+        
+        # Générer le CV (sauf s'il est déjà en cache)
+        cached = not profile and app.config['CACHE_ENABLED'] and blob_store.touch(blob_name(cv_id))
+        if not cached and not profile and not inline and is_async_request(payload):
+            try:
+                job_id = job_queue.submit(render_job, data, cv_id, theme, session_id)
+            except QueueFull as e:
+                response = jsonify({
+                    "success": False,
+                    "error": str(e)
+                })
+                response.headers['Retry-After'] = '5'
+                return response, 429
+            
+            status_url = url_for('job_status', job_id=job_id, _external=True)
+            response = jsonify({
+                "success": True,
+                "job_id": job_id,
+                "status": "queued",
+                "status_url": status_url,
+                "message": "Génération du CV en cours"
+            })
+            response.headers['Location'] = status_url
+            return response, 202
+        
+        if profile:
+            profile_cv(data, cv_id, theme)
+        elif inline:
+            pdf_bytes, cached = ensure_cv_bytes(data, cv_id, theme, session_id)
+        elif not cached:
+            cached = ensure_cv(data, cv_id, theme, session_id)
         
         # Construire l'URL de téléchargement
         download_url = url_for('download_cv', cv_id=cv_id, _external=True)
         
-        return jsonify({
+        if inline and not profile and len(pdf_bytes) <= app.config['INLINE_MAX_BYTES']:
+            return inline_pdf_response(pdf_bytes, cv_id, cached, download_url)
+        
+        response = {
             "success": True,
             "cv_id": cv_id,
             "download_url": download_url,
+            "cached": cached,
             "message": "CV généré avec succès"
+        }
+        if inline:
+            # PDF trop volumineux (ou profilage) : repli sur le téléchargement par URL
+            response['response_mode'] = 'url'
+        if profile:
+            response['profile_url'] = url_for('download_profile', cv_id=cv_id, _external=True)
+        return jsonify(response), 200
+        
+    except RenderTimeout as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 504
+    
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+def batch_limit_error():
+    """Réponse 400 d'un lot de plus de BATCH_MAX_ITEMS CV"""
+    return jsonify({
+        "success": False,
+        "error": f"Un lot est limité à {app.config['BATCH_MAX_ITEMS']} CV"
+    }), 400
+
+
+@app.route('/generate-cv/batch', methods=['POST'])
+def generate_cv_batch():
+    """
+    Génère plusieurs CV en une seule requête
+    
+    Body (JSON):
+    {
+        "csv_contents": ["section,subsection,type,content,order\\n...", "..."],
+        "format": "ids" | "zip"
+    }
+    
+    Ou (multipart/form-data):
+    - csv_files: plusieurs fichiers CSV
+    - format: "ids" | "zip"
+    
+    Response (format "ids", par défaut):
+    {
+        "success": true,
+        "count": 2,
+        "results": [
+            {"index": 0, "success": true, "cv_id": "uuid", "download_url": "...", "cached": false},
+            {"index": 1, "success": false, "error": "..."}
+        ]
+    }
+    
+    Response (format "zip"): archive ZIP des PDF, transmise au fil des rendus
+    (les CSV en erreur sont listés dans errors.txt)
+    """
+    try:
+        if request.is_json:
+            payload = request.get_json()
+            csv_contents = payload.get('csv_contents')
+            if isinstance(csv_contents, list) and len(csv_contents) > app.config['BATCH_MAX_ITEMS']:
+                return batch_limit_error()
+            if not isinstance(csv_contents, list) or not csv_contents \
+                    or not all(isinstance(c, str) and c for c in csv_contents):
+                return jsonify({
+                    "success": False,
+                    "error": "Le champ 'csv_contents' doit être une liste non vide de contenus CSV"
+                }), 400
+            sources = csv_contents
+            names = [f"cv_{i + 1:04d}.pdf" for i in range(len(csv_contents))]
+        
+        elif 'csv_files' in request.files:
+            payload = request.form
+            files = request.files.getlist('csv_files')
+            # Avant toute lecture : un lot trop grand n'est ni lu ni décodé
+            if len(files) > app.config['BATCH_MAX_ITEMS']:
+                return batch_limit_error()
+            if not all(f.filename.endswith('.csv') for f in files):
+                return jsonify({
+                    "success": False,
+                    "error": "Tous les fichiers doivent être des CSV"
+                }), 400
+            # Lecture en flux, un fichier à la fois : seul le modèle parsé de chaque CV
+            # est gardé (les fichiers sont fermés avec la requête, avant la fin d'un ZIP)
+            sources = []
+            for f in files:
+                stream = io.TextIOWrapper(f.stream, encoding='utf-8', newline='')
+                try:
+                    sources.append(parse_csv_content(stream))
+                except Exception as e:
+                    sources.append(e)
+                finally:
+                    # Le flux de l'upload reste géré (et fermé) par Werkzeug
+                    stream.detach()
+            names = [
+                f"{i + 1:04d}_{secure_filename(f.filename)[:-len('.csv')] or 'cv'}.pdf"
+                for i, f in enumerate(files)
+            ]
+        
+        else:
+            return jsonify({
+                "success": False,
+                "error": "Aucun contenu CSV fourni. Utilisez 'csv_contents' (JSON) ou 'csv_files' (multipart)"
+            }), 400
+        
+        output_format = request.args.get('format') or payload.get('format') or 'ids'
+        if output_format not in ('ids', 'zip'):
+            return jsonify({
+                "success": False,
+                "error": "Le format doit être 'ids' ou 'zip'"
+            }), 400
+        
+        theme = 'default'
+        executor = ThreadPoolExecutor(max_workers=batch_workers(), thread_name_prefix='cv-batch')
+        futures = [executor.submit(render_batch_item, source, theme) for source in sources]
+        executor.shutdown(wait=False)
+        
+        if output_format == 'zip':
+            return Response(
+                stream_batch_zip(futures, names),
+                mimetype='application/zip',
+                headers={'Content-Disposition': 'attachment; filename=cv_batch.zip'}
+            )
+        
+        results = []
+        for index, future in enumerate(futures):
+            try:
+                cv_id, cached = future.result()
+                results.append({
+                    "index": index,
+                    "success": True,
+                    "cv_id": cv_id,
+                    "download_url": url_for('download_cv', cv_id=cv_id, _external=True),
+                    "cached": cached
+                })
+            except Exception as e:
+                results.append({
+                    "index": index,
+                    "success": False,
+                    "error": str(e)
+                })
+        
+        return jsonify({
+            "success": all(r['success'] for r in results),
+            "count": len(results),
+            "results": results
         }), 200
         
     except Exception as e:
@@ -489,6 +954,70 @@ def generate_cv():
         }), 500
 
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Métriques au format texte Prometheus (propres au processus qui répond)"""
+    stats = blob_store.stats.as_dict()
+    lines = cv_metrics.stage_seconds.render()
+    lines += cv_metrics.gauge('cv_storage_hits_total', "Lectures du stockage ayant trouvé le PDF", stats['hits'], 'counter')
+    lines += cv_metrics.gauge('cv_storage_misses_total', "Lectures du stockage sans PDF", stats['misses'], 'counter')
+    lines += cv_metrics.gauge('cv_storage_hit_ratio', "Proportion de lectures du stockage ayant trouvé le PDF", stats['hit_ratio'])
+    lines += cv_metrics.gauge('cv_storage_puts_total', "PDF écrits dans le stockage", stats['puts'], 'counter')
+    lines += cv_metrics.gauge('cv_storage_expired_total', "PDF supprimés car expirés", stats['expired'], 'counter')
+    lines += cv_metrics.gauge('cv_storage_evicted_total', "PDF supprimés pour respecter la taille maximale", stats['evicted'], 'counter')
+    lines += cv_metrics.gauge('cv_storage_entries', "PDF présents dans le stockage (dernière purge)", stats['entries'])
+    lines += cv_metrics.gauge('cv_storage_bytes', "Taille des PDF du stockage (dernière purge)", stats['bytes'])
+    lines += cv_metrics.gauge('cv_job_queue_depth', "Jobs asynchrones en attente ou en cours", job_queue.depth())
+    lines += cv_metrics.gauge('cv_output_folder_bytes', "Taille du dossier de sortie (dernière purge)", _output_folder_bytes)
+    flights = single_flight.as_dict()
+    lines += cv_metrics.gauge('cv_render_coalesced_total', "Rendus évités : requête identique simultanée servie par le rendu d'une autre", flights['coalesced'], 'counter')
+    lines += cv_metrics.gauge('cv_render_lock_waits_total', "Rendus ayant attendu un rendu identique en cours", flights['waited'], 'counter')
+    lines += cv_metrics.gauge('cv_render_lock_timeouts_total', "Attentes d'un rendu identique abandonnées (délai dépassé)", flights['timeouts'], 'counter')
+    paragraphs = paragraph_cache_stats() or {}
+    lines += cv_metrics.gauge('cv_paragraph_parse_hits_total', "Paragraphes dont le markup était déjà parsé", paragraphs.get('parse_hits', 0), 'counter')
+    lines += cv_metrics.gauge('cv_paragraph_parse_misses_total', "Paragraphes dont le markup a été parsé", paragraphs.get('parse_misses', 0), 'counter')
+    lines += cv_metrics.gauge('cv_paragraph_wrap_hits_total', "Paragraphes dont les lignes étaient déjà découpées", paragraphs.get('wrap_hits', 0), 'counter')
+    lines += cv_metrics.gauge('cv_paragraph_wrap_misses_total', "Paragraphes dont les lignes ont été découpées", paragraphs.get('wrap_misses', 0), 'counter')
+    lines += cv_metrics.gauge('cv_paragraph_cache_entries', "Couples (texte, style) dans le cache de paragraphes", paragraphs.get('entries', 0))
+    return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """
+    Retourne l'état d'un job de génération asynchrone
+    
+    Response:
+    {
+        "success": true,
+        "job_id": "uuid",
+        "status": "queued" | "running" | "done" | "failed",
+        "cv_id": "uuid",              (si status == done)
+        "download_url": "...",        (si status == done)
+        "error": "..."                (si status == failed)
+    }
+    """
+    job = job_queue.get(secure_filename(job_id))
+    if job is None:
+        return jsonify({
+            "success": False,
+            "error": "Job non trouvé"
+        }), 404
+    
+    response = {
+        "success": job['status'] != 'failed',
+        "job_id": job['job_id'],
+        "status": job['status']
+    }
+    if job['status'] == 'done':
+        cv_id = job['result']['cv_id']
+        response['cv_id'] = cv_id
+        response['download_url'] = url_for('download_cv', cv_id=cv_id, _external=True)
+    elif job['status'] == 'failed':
+        response['error'] = job['error']
+    return jsonify(response), 200
+
+
 @app.route('/download-cv/<cv_id>', methods=['GET'])
 def download_cv(cv_id):
     """
@@ -498,24 +1027,91 @@ def download_cv(cv_id):
     - cv_id: UUID du CV généré
     
     Response:
-    - Fichier PDF
+    - Fichier PDF, transmis par blocs
+    
+    Le contenu d'un cv_id ne change jamais (rendu déterministe) : il sert
+    d'ETag. Un client qui renvoie If-None-Match reçoit un 304 sans corps,
+    et les requêtes Range permettent de reprendre un téléchargement (206).
     """
     try:
         # Sécuriser le cv_id
         cv_id = secure_filename(cv_id)
-        file_path = os.path.join(app.config['OUTPUT_FOLDER'], f"{cv_id}.pdf")
+        name = blob_name(cv_id)
+        
+        # Revalidation : inutile d'ouvrir le fichier
+        if request.if_none_match.contains_weak(cv_id) and blob_store.touch(name):
+            response = Response(status=304)
+            response.set_etag(cv_id)
+            response.cache_control.private = True
+            response.cache_control.max_age = app.config['CACHE_MAX_AGE']
+            return response
         
-        if not os.path.exists(file_path):
+        pdf_file = blob_store.open(name)
+        
+        if pdf_file is None:
             return jsonify({
                 "success": False,
                 "error": "CV non trouvé"
             }), 404
         
+        return stream_blob(pdf_file, cv_id, 'application/pdf', 'cv_generated.pdf')
+        
+    except HTTPException as e:
+        return e
+    
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@app.route('/profiles/<cv_id>', methods=['GET'])
+def download_profile(cv_id):
+    """
+    Télécharge le profil cProfile d'un rendu (X-Admin-Token requis)
+    
+    Params:
+    - cv_id: UUID du CV profilé
+    - format: "prof" (défaut, fichier pstats) ou "text" (résumé des fonctions)
+    - sort: tri du résumé texte (défaut: cumulative)
+    - limit: nombre de lignes du résumé texte (défaut: 40)
+    """
+    if not is_admin_request():
+        return jsonify({
+            "success": False,
+            "error": "Accès réservé aux administrateurs (X-Admin-Token)"
+        }), 403
+    
+    try:
+        cv_id = secure_filename(cv_id)
+        data = blob_store.get(profile_name(cv_id))
+        if data is None:
+            return jsonify({
+                "success": False,
+                "error": "Profil non trouvé"
+            }), 404
+        
+        if request.args.get('format', 'prof') == 'text':
+            sort = request.args.get('sort', 'cumulative')
+            # Clés de tri de pstats (SortKey et leurs alias : tottime, cumtime...)
+            sort_keys = sorted(set(pstats.Stats.sort_arg_dict_default) | {key.value for key in pstats.SortKey})
+            if sort not in sort_keys:
+                return jsonify({
+                    "success": False,
+                    "error": f"Tri inconnu: {sort} (valeurs acceptées: {', '.join(sort_keys)})"
+                }), 400
+            output = io.StringIO()
+            stats = pstats.Stats(_LoadedProfile(data), stream=output)
+            stats.sort_stats(sort)
+            stats.print_stats(request.args.get('limit', 40, type=int))
+            return Response(output.getvalue(), mimetype='text/plain')
+        
         return send_file(
-            file_path,
-            mimetype='application/pdf',
+            io.BytesIO(data),
+            mimetype='application/octet-stream',
             as_attachment=True,
-            download_name='cv_generated.pdf'
+            download_name=profile_name(cv_id)
         )
         
     except Exception as e:
@@ -544,7 +1140,7 @@ def openapi_spec():
             "/generate-cv": {
                 "post": {
                     "summary": "Génère un CV à partir d'un contenu CSV",
-                    "description": "Prend un contenu CSV en entrée et génère un CV professionnel en PDF",
+                    "description": "Prend un contenu CSV (csv_content) ou un CV structuré en JSON (cv) et génère un CV professionnel en PDF",
                     "operationId": "generateCV",
                     "requestBody": {
                         "required": True,
@@ -556,9 +1152,59 @@ def openapi_spec():
                                         "csv_content": {
                                             "type": "string",
                                             "description": "Contenu du fichier CSV avec les colonnes: section, subsection, type, content, order"
+                                        },
+                                        "cv": {
+                                            "type": "object",
+                                            "description": "CV structuré, sans CSV (à la place de csv_content) ; les listes sont affichées dans l'ordre donné",
+                                            "additionalProperties": False,
+                                            "properties": {
+                                                "header": {
+                                                    "type": "object",
+                                                    "additionalProperties": False,
+                                                    "properties": {name: {"type": "string"} for name in Header.__slots__}
+                                                },
+                                                "profil": {"type": "string"},
+                                                "experiences": {
+                                                    "type": "array",
+                                                    "items": {
+                                                        "type": "object",
+                                                        "additionalProperties": False,
+                                                        "required": ["titre"],
+                                                        "properties": {
+                                                            "titre": {"type": "string"},
+                                                            "periode": {"type": "string"},
+                                                            "bullets": {"type": "array", "items": {"type": "string"}}
+                                                        }
+                                                    }
+                                                },
+                                                "formations": {
+                                                    "type": "array",
+                                                    "items": {
+                                                        "type": "object",
+                                                        "additionalProperties": False,
+                                                        "required": ["titre"],
+                                                        "properties": {name: {"type": "string"} for name in FORMATION_FIELDS}
+                                                    }
+                                                },
+                                                **{name: {"type": "array", "items": {"type": "string"}} for name in LIST_SECTIONS}
+                                            }
+                                        },
+                                        "async": {
+                                            "type": "boolean",
+                                            "description": "Génération en arrière-plan : réponse 202 avec un job_id à suivre via /jobs/{job_id}"
+                                        },
+                                        "session_id": {
+                                            "type": "string",
+                                            "maxLength": 128,
+                                            "description": "Identifiant de session (ex: conversation) : les CV successifs d'une session ne re-rendent que les sections modifiées"
+                                        },
+                                        "response_mode": {
+                                            "type": "string",
+                                            "enum": ["url", "inline"],
+                                            "default": "url",
+                                            "description": "'inline' : le PDF est retourné dans la réponse (pdf_base64, ou PDF brut avec Accept: application/pdf), sans appel à /download-cv ; repli sur 'url' au-delà de la taille maximale"
                                         }
-                                    },
-                                    "required": ["csv_content"]
+                                    }
                                 },
                                 "example": {
                                     "csv_content": "section,subsection,type,content,order\nheader,nom,text,SUAN TAY,1\nheader,titre,text,Ingénieur IA,2\n"
@@ -585,19 +1231,230 @@ def openapi_spec():
                                                 "type": "string",
                                                 "format": "uri"
                                             },
+                                            "cached": {
+                                                "type": "boolean",
+                                                "description": "true si un PDF identique existait déjà"
+                                            },
+                                            "response_mode": {
+                                                "type": "string",
+                                                "enum": ["url", "inline"],
+                                                "description": "Présent si response_mode=inline était demandé : 'url' si le PDF était trop volumineux pour être inclus"
+                                            },
+                                            "content_type": {
+                                                "type": "string",
+                                                "description": "Mode inline : type du contenu (application/pdf)"
+                                            },
+                                            "size_bytes": {
+                                                "type": "integer",
+                                                "description": "Mode inline : taille du PDF en octets"
+                                            },
+                                            "pdf_base64": {
+                                                "type": "string",
+                                                "contentEncoding": "base64",
+                                                "contentMediaType": "application/pdf",
+                                                "description": "Mode inline : PDF encodé en base64"
+                                            },
                                             "message": {
                                                 "type": "string"
                                             }
                                         }
                                     }
+                                },
+                                "application/pdf": {
+                                    "schema": {
+                                        "type": "string",
+                                        "format": "binary"
+                                    }
+                                }
+                            }
+                        },
+                        "202": {
+                            "description": "Génération planifiée (mode asynchrone)",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "success": {
+                                                "type": "boolean"
+                                            },
+                                            "job_id": {
+                                                "type": "string",
+                                                "format": "uuid"
+                                            },
+                                            "status": {
+                                                "type": "string"
+                                            },
+                                            "status_url": {
+                                                "type": "string",
+                                                "format": "uri"
+                                            }
+                                        }
+                                    }
                                 }
                             }
                         },
                         "400": {
                             "description": "Requête invalide"
                         },
+                        "429": {
+                            "description": "File de génération pleine"
+                        },
                         "500": {
                             "description": "Erreur serveur"
+                        },
+                        "504": {
+                            "description": "Délai de rendu dépassé"
+                        }
+                    }
+                }
+            },
+            "/generate-cv/batch": {
+                "post": {
+                    "summary": "Génère plusieurs CV en une requête",
+                    "description": "Rend une liste de contenus CSV en parallèle et retourne la liste des identifiants, ou une archive ZIP des PDF (format=zip)",
+                    "operationId": "generateCVBatch",
+                    "requestBody": {
+                        "required": True,
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "object",
+                                    "properties": {
+                                        "csv_contents": {
+                                            "type": "array",
+                                            "items": {
+                                                "type": "string"
+                                            },
+                                            "description": "Contenus CSV à générer"
+                                        },
+                                        "format": {
+                                            "type": "string",
+                                            "enum": ["ids", "zip"],
+                                            "default": "ids"
+                                        }
+                                    },
+                                    "required": ["csv_contents"]
+                                }
+                            }
+                        }
+                    },
+                    "responses": {
+                        "200": {
+                            "description": "Résultat par CSV (format ids) ou archive ZIP (format zip)",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "success": {
+                                                "type": "boolean"
+                                            },
+                                            "count": {
+                                                "type": "integer"
+                                            },
+                                            "results": {
+                                                "type": "array",
+                                                "items": {
+                                                    "type": "object",
+                                                    "properties": {
+                                                        "index": {
+                                                            "type": "integer"
+                                                        },
+                                                        "success": {
+                                                            "type": "boolean"
+                                                        },
+                                                        "cv_id": {
+                                                            "type": "string",
+                                                            "format": "uuid"
+                                                        },
+                                                        "download_url": {
+                                                            "type": "string",
+                                                            "format": "uri"
+                                                        },
+                                                        "cached": {
+                                                            "type": "boolean"
+                                                        },
+                                                        "error": {
+                                                            "type": "string"
+                                                        }
+                                                    }
+                                                }
+                                            }
+                                        }
+                                    }
+                                },
+                                "application/zip": {
+                                    "schema": {
+                                        "type": "string",
+                                        "format": "binary"
+                                    }
+                                }
+                            }
+                        },
+                        "400": {
+                            "description": "Requête invalide"
+                        },
+                        "500": {
+                            "description": "Erreur serveur"
+                        }
+                    }
+                }
+            },
+            "/jobs/{job_id}": {
+                "get": {
+                    "summary": "État d'une génération asynchrone",
+                    "description": "Retourne l'état d'un job (queued, running, done, failed) et l'URL de téléchargement une fois terminé",
+                    "operationId": "getJobStatus",
+                    "parameters": [
+                        {
+                            "name": "job_id",
+                            "in": "path",
+                            "required": True,
+                            "schema": {
+                                "type": "string",
+                                "format": "uuid"
+                            },
+                            "description": "Identifiant du job retourné par /generate-cv"
+                        }
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "État du job",
+                            "content": {
+                                "application/json": {
+                                    "schema": {
+                                        "type": "object",
+                                        "properties": {
+                                            "success": {
+                                                "type": "boolean"
+                                            },
+                                            "job_id": {
+                                                "type": "string",
+                                                "format": "uuid"
+                                            },
+                                            "status": {
+                                                "type": "string",
+                                                "enum": ["queued", "running", "done", "failed"]
+                                            },
+                                            "cv_id": {
+                                                "type": "string",
+                                                "format": "uuid"
+                                            },
+                                            "download_url": {
+                                                "type": "string",
+                                                "format": "uri"
+                                            },
+                                            "error": {
+                                                "type": "string"
+                                            }
+                                        }
+                                    }
+                                }
+                            }
+                        },
+                        "404": {
+                            "description": "Job non trouvé"
                         }
                     }
                 }
@@ -617,11 +1474,29 @@ def openapi_spec():
                                 "format": "uuid"
                             },
                             "description": "UUID du CV à télécharger"
+                        },
+                        {
+                            "name": "If-None-Match",
+                            "in": "header",
+                            "required": False,
+                            "schema": {
+                                "type": "string"
+                            },
+                            "description": "ETag d'une copie déjà téléchargée : réponse 304 si elle est à jour"
+                        },
+                        {
+                            "name": "Range",
+                            "in": "header",
+                            "required": False,
+                            "schema": {
+                                "type": "string"
+                            },
+                            "description": "Plage d'octets (ex: bytes=0-1023) pour reprendre un téléchargement"
                         }
                     ],
                     "responses": {
                         "200": {
-                            "description": "Fichier PDF du CV",
+                            "description": "Fichier PDF du CV (en-têtes ETag et Accept-Ranges)",
                             "content": {
                                 "application/pdf": {
                                     "schema": {
@@ -631,6 +1506,23 @@ def openapi_spec():
                                 }
                             }
                         },
+                        "206": {
+                            "description": "Partie du fichier PDF demandée par l'en-tête Range",
+                            "content": {
+                                "application/pdf": {
+                                    "schema": {
+                                        "type": "string",
+                                        "format": "binary"
+                                    }
+                                }
+                            }
+                        },
+                        "304": {
+                            "description": "La copie du client (If-None-Match) est à jour"
+                        },
+                        "416": {
+                            "description": "Plage demandée hors du fichier"
+                        },
                         "404": {
                             "description": "CV non trouvé"
                         }
@@ -655,6 +1547,22 @@ def openapi_spec():
                                             "timestamp": {
                                                 "type": "string",
                                                 "format": "date-time"
+                                            },
+                                            "storage": {
+                                                "type": "object",
+                                                "description": "Compteurs du stockage des PDF (hits, misses, évictions, taille)"
+                                            },
+                                            "paragraph_cache": {
+                                                "type": ["object", "null"],
+                                                "description": "Compteurs du cache de paragraphes (markup parsé, lignes découpées) ; null avant le premier rendu"
+                                            },
+                                            "single_flight": {
+                                                "type": "object",
+                                                "description": "Regroupement des rendus identiques simultanés (leaders, waited, coalesced, timeouts, in_flight)"
+                                            },
+                                            "startup": {
+                                                "type": ["object", "null"],
+                                                "description": "Durées du préchauffage en ms (CV_WARMUP=1) ; null sans préchauffage"
                                             }
                                         }
                                     }
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Point d'entrée ASGI de l'API (mode asynchrone)
+
+L'application Flask de cv_api.py reste inchangée : ce module l'expose en
+ASGI. Les entrées/sorties réseau sont asynchrones (un client lent qui
+envoie 16 Mo ou télécharge son PDF n'occupe qu'une coroutine) ; seul le
+code Flask s'exécute dans des threads :
+
+- /generate-cv et /generate-cv/batch (rendu, lié au CPU) : pool borné
+  (CV_ASGI_RENDER_THREADS), les rendus en excès attendent leur tour
+- les autres routes (téléchargements, santé, jobs...) : pool d'E/S
+
+Le corps de la requête est entièrement reçu avant d'appeler Flask (en
+mémoire jusqu'à 1 Mo, puis dans un fichier temporaire) ; la réponse est
+envoyée bloc par bloc, à la vitesse du client.
+
+Usage:
+    uvicorn cv_asgi:app --workers 2
+    CV_WARMUP=1 gunicorn cv_asgi:app --preload -k uvicorn.workers.UvicornWorker --workers 2
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from werkzeug.wsgi import FileWrapper
+
+from cv_api import app as flask_app
+
+
+# Rendus simultanés par processus (défaut : nombre de cœurs)
+RENDER_THREADS = int(os.environ.get('CV_ASGI_RENDER_THREADS', os.cpu_count() or 1))
+# Threads pour les autres routes (lectures du stockage, réponses courtes)
+IO_THREADS = int(os.environ.get('CV_ASGI_IO_THREADS', 32))
+
+# Routes dont le traitement est lié au CPU (rendu des PDF)
+RENDER_PATHS = ('/generate-cv',)
+
+# Corps de requête gardé en mémoire jusqu'à cette taille, puis écrit sur disque
+SPOOL_MAX_BYTES = 1024 * 1024
+
+# Taille des blocs lus dans le stockage et envoyés au client
+CHUNK_SIZE = 64 * 1024
+
+
+class RequestTooLarge(Exception):
+    """Levée quand le corps de la requête dépasse MAX_CONTENT_LENGTH"""
+
+
+class ClientDisconnected(Exception):
+    """Levée quand le client ferme la connexion avant la fin de l'envoi du corps"""
+
+
+class AsgiBridge:
+    """
+    Adapte une application WSGI (Flask) au protocole ASGI
+
+    Les pools de threads sont créés à la première requête de chaque processus
+    (jamais dans le master gunicorn avec --preload).
+    """
+
+    def __init__(self, wsgi_app, render_threads=RENDER_THREADS, io_threads=IO_THREADS):
+        self.wsgi_app = wsgi_app
+        self.render_threads = render_threads
+        self.io_threads = io_threads
+        self._pools = None
+        self._pid = None
+
+    def _get_pools(self):
+        if self._pools is None or self._pid != os.getpid():
+            self._pools = (
+                ThreadPoolExecutor(max_workers=self.render_threads, thread_name_prefix='cv-render'),
+                ThreadPoolExecutor(max_workers=self.io_threads, thread_name_prefix='cv-io'),
+            )
+            self._pid = os.getpid()
+        return self._pools
+
+    def shutdown(self):
+        if self._pools is not None and self._pid == os.getpid():
+            for pool in self._pools:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._pools = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            await self.handle_http(scope, receive, send)
+        elif scope['type'] == 'lifespan':
+            await self.handle_lifespan(receive, send)
+
+    async def handle_lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def handle_http(self, scope, receive, send):
+        try:
+            body = await self.read_body(scope, receive)
+        except RequestTooLarge:
+            await self.send_error(send, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            return
+        except ClientDisconnected:
+            return
+
+        with body:
+            environ = self.build_environ(scope, body)
+            render_pool, io_pool = self._get_pools()
+            pool = render_pool if scope['path'].startswith(RENDER_PATHS) else io_pool
+            loop = asyncio.get_running_loop()
+
+            started = {'written': []}
+
+            def start_response(status, headers, exc_info=None):
+                started['status'] = int(status.split(' ', 1)[0])
+                started['headers'] = [
+                    (name.lower().encode('latin-1'), value.encode('latin-1'))
+                    for name, value in headers
+                ]
+                return started['written'].append
+
+            iterable = await loop.run_in_executor(pool, self.wsgi_app, environ, start_response)
+            try:
+                await self.send_response(iterable, started, send, receive, io_pool)
+            finally:
+                close = getattr(iterable, 'close', None)
+                if close is not None:
+                    # Ex: annulation des rendus d'un lot ZIP si le client s'est déconnecté
+                    await loop.run_in_executor(io_pool, close)
+
+    async def read_body(self, scope, receive):
+        """Reçoit le corps de la requête sans bloquer ; retourne un fichier positionné au début"""
+        max_bytes = flask_app.config['MAX_CONTENT_LENGTH']
+        declared = self.header(scope, b'content-length')
+        if max_bytes is not None and declared is not None and declared.isdigit() and int(declared) > max_bytes:
+            raise RequestTooLarge()
+
+        body = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        size = 0
+        try:
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    raise ClientDisconnected()
+                chunk = message.get('body', b'')
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise RequestTooLarge()
+                body.write(chunk)
+                if not message.get('more_body', False):
+                    break
+        except Exception:
+            body.close()
+            raise
+        body.seek(0)
+        return body
+
+    async def send_response(self, iterable, started, send, receive, io_pool):
+        """
+        Envoie la réponse WSGI bloc par bloc (les blocs sont lus dans le pool d'E/S)
+
+        Si le client se déconnecte, plus aucun bloc n'est demandé à l'itérable :
+        l'appelant le ferme dès que la lecture en cours est terminée.
+        """
+        loop = asyncio.get_running_loop()
+        iterator = iter(iterable)
+        done = object()
+        disconnected = asyncio.ensure_future(self.wait_disconnect(receive))
+        try:
+            chunk = await self.next_chunk(loop, io_pool, iterator, done, disconnected)
+            if chunk is None:
+                return
+            await send({
+                'type': 'http.response.start',
+                'status': started['status'],
+                'headers': started['headers'],
+            })
+            for data in started['written']:
+                await send({'type': 'http.response.body', 'body': data, 'more_body': True})
+            while chunk is not done:
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                chunk = await self.next_chunk(loop, io_pool, iterator, done, disconnected)
+                if chunk is None:
+                    return
+            await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+        finally:
+            disconnected.cancel()
+
+    @staticmethod
+    async def wait_disconnect(receive):
+        """Attend la déconnexion du client (le corps de la requête est déjà reçu)"""
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    @staticmethod
+    async def next_chunk(loop, io_pool, iterator, done, disconnected):
+        """Bloc suivant de l'itérable, done à la fin, ou None si le client s'est déconnecté"""
+        pending = loop.run_in_executor(io_pool, next, iterator, done)
+        await asyncio.wait((pending, disconnected), return_when=asyncio.FIRST_COMPLETED)
+        if disconnected.done():
+            # La lecture en cours ne peut pas être interrompue : l'itérable
+            # (ex: générateur) n'est fermé qu'une fois qu'elle a rendu la main
+            await asyncio.wait((pending,))
+            if not pending.cancelled():
+                pending.exception()
+            return None
+        return pending.result()
+
+    async def send_error(self, send, status):
+        body = f"{status.value} {status.phrase}".encode('ascii')
+        await send({
+            'type': 'http.response.start',
+            'status': status.value,
+            'headers': [(b'content-type', b'text/plain'), (b'content-length', str(len(body)).encode('ascii'))],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    @staticmethod
+    def header(scope, name):
+        for key, value in scope.get('headers', ()):
+            if key.lower() == name:
+                return value.decode('latin-1')
+        return None
+
+    @staticmethod
+    def build_environ(scope, body):
+        """Environnement WSGI (PEP 3333) d'une requête ASGI dont le corps est déjà reçu"""
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client')
+        body_size = body.seek(0, os.SEEK_END)
+        body.seek(0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'CONTENT_LENGTH': str(body_size),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            'wsgi.input_terminated': True,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+            'wsgi.file_wrapper': lambda f, buffer_size=CHUNK_SIZE: FileWrapper(f, max(buffer_size, CHUNK_SIZE)),
+        }
+        if client:
+            environ['REMOTE_ADDR'] = client[0]
+            environ['REMOTE_PORT'] = str(client[1])
+        for name, value in scope.get('headers', ()):
+            name = name.decode('latin-1').upper().replace('-', '_')
+            value = value.decode('latin-1')
+            if name == 'CONTENT_LENGTH':
+                continue
+            key = name if name == 'CONTENT_TYPE' else f'HTTP_{name}'
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+        return environ
+
+
+app = AsgiBridge(flask_app)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("🚀 Démarrage de l'API CV Generator (ASGI)")
+    print(f"⚙️  Rendus simultanés: {RENDER_THREADS}, threads d'E/S: {IO_THREADS}")
+    uvicorn.run(app, host='0.0.0.0', port=5000)
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Benchmarks du générateur de CV (hors ligne)
+
+Mesure séparément les étapes du rendu sur des CV synthétiques de taille
+croissante, puis l'API Flask de bout en bout via son client de test :
+
+- parse  : lecture du CSV (cv_model.parse_csv)
+- story  : construction des flowables (cv_engine.build_story)
+- layout : mise en page et écriture du PDF (cv_engine.write_pdf)
+
+Chaque étape est mesurée à froid (cache de paragraphes vidé) et cache
+chaud (même CV rendu une seconde fois), en colonnes séparées.
+
+La mise en page seule est aussi mesurée sur un CV qui grandit d'une à
+--pages pages : le temps par page doit rester à peu près constant.
+
+La taille des PDF produits est mesurée avec et sans compression des pages,
+avec la police configurée (Helvetica, ou la police TrueType de CV_FONT_PATH).
+
+Usage:
+    python cv_bench.py                              # toutes les tailles + API
+    python cv_bench.py --sizes tiny,large -n 50     # tailles choisies, 50 itérations
+    python cv_bench.py --api-requests 200 --concurrency 8
+    python cv_bench.py --no-api --json              # résultats en JSON
+    python cv_bench.py --sizes tiny --no-api --pages 20   # pagination jusqu'à 20 pages
+    CV_FONT_PATH=DejaVuSans.ttf python cv_bench.py --no-api   # tailles avec police embarquée
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import resource
+import sys
+import threading
+import time
+
+from cv_model import parse_csv
+
+
+# Tailles des CV synthétiques : (nombre d'expériences, bullets par expérience)
+SIZES = {
+    'tiny': (1, 2),
+    'small': (3, 4),
+    'medium': (10, 5),
+    'large': (25, 8),
+    'xl': (50, 10),  # 500 bullets
+}
+
+LOREM = (
+    "Conçu et déployé des <b>pipelines de données</b> en production, avec suivi "
+    "de la qualité, documentation et accompagnement des équipes métier"
+)
+
+
+def synthetic_csv(experiences, bullets, formations=3, skills=8):
+    """Génère un CV synthétique au format CSV"""
+    rows = ['section,subsection,type,content,order']
+    rows += [
+        'header,nom,text,Jean DUPONT,1',
+        'header,titre,text,Ingénieur Data,2',
+        'header,email,text,jean.dupont@example.com,3',
+        'header,telephone,text,+33 6 00 00 00 00,4',
+        'header,localisation,text,Lyon,5',
+        'header,linkedin,text,jeandupont,6',
+        'langues,francais,text,Français - Natif,1',
+        'langues,anglais,text,Anglais - Courant,2',
+        'profil,description,paragraph,"' + ' '.join([LOREM] * 3) + '",1',
+    ]
+    for i in range(skills):
+        rows.append(f'competences_cles,c{i:03d},text,"<b>Compétence {i}</b>: outils, méthodes",{i}')
+        rows.append(f'competences_tech,t{i:03d},text,"<b>Technologie {i}</b>: Python, SQL, Spark",{i}')
+    for i in range(experiences):
+        rows.append(f'experience,exp{i}_titre,text,Poste {i} - Entreprise {i},{i}')
+        rows.append(f'experience,exp{i}_periode,text,2015 - 2020 | Ville {i},{i}')
+        for j in range(bullets):
+            rows.append(f'experience,exp{i}_bullet{j},bullet,"{LOREM} ({i}.{j})",{j}')
+    for i in range(formations):
+        rows.append(f'formation,f{i}_titre,text,Diplôme {i},{i}')
+        rows.append(f'formation,f{i}_periode,text,2010 - 2012,{i}')
+        rows.append(f'formation,f{i}_description,text,Description de la formation {i},{i}')
+    rows.append('centres_interet,sport,text,Course à pied,1')
+    return '\n'.join(rows) + '\n'
+
+
+def percentile(values, p):
+    """Percentile (rang le plus proche) d'une liste de durées"""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def summarize(values):
+    """p50 / p99 / moyenne en millisecondes"""
+    return {
+        'p50_ms': round(percentile(values, 50) * 1000, 2),
+        'p99_ms': round(percentile(values, 99) * 1000, 2),
+        'mean_ms': round(sum(values) / len(values) * 1000, 2),
+    }
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du processus (Mo)"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sur macOS, en kilo-octets sur Linux
+    return round(rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def bench_stages(size, iterations, theme='default'):
+    """
+    Mesure parse / story / layout pour une taille de CV
+
+    Chaque itération vide d'abord le cache de paragraphes (rendu à froid :
+    markup parsé et lignes découpées), puis rend une seconde fois le même CV
+    (cache chaud, comme pour un CV déjà vu par le worker). Les deux séries
+    sont rapportées séparément.
+    """
+    import cv_engine
+
+    csv_content = synthetic_csv(*SIZES[size])
+    styles = cv_engine.get_styles(theme)
+    timings = {
+        label: {'parse': [], 'story': [], 'layout': [], 'total': []}
+        for label in ('cold', 'warm')
+    }
+    pdf_size = 0
+
+    for _ in range(iterations):
+        cv_engine.paragraph_cache.clear()
+        for label in ('cold', 'warm'):
+            t0 = time.perf_counter()
+            data = parse_csv(csv_content)
+            t1 = time.perf_counter()
+            story = cv_engine.build_story(data, styles)
+            t2 = time.perf_counter()
+            buffer = io.BytesIO()
+            cv_engine.write_pdf(story, buffer, theme)
+            t3 = time.perf_counter()
+
+            timings[label]['parse'].append(t1 - t0)
+            timings[label]['story'].append(t2 - t1)
+            timings[label]['layout'].append(t3 - t2)
+            timings[label]['total'].append(t3 - t0)
+            pdf_size = buffer.tell()
+
+    return {
+        'size': size,
+        'csv_bytes': len(csv_content.encode('utf-8')),
+        'pdf_bytes': pdf_size,
+        'stages': {stage: summarize(values) for stage, values in timings['cold'].items()},
+        'stages_warm': {stage: summarize(values) for stage, values in timings['warm'].items()},
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def bench_output_size(size, theme='default'):
+    """Taille du PDF (octets) sans puis avec compression des pages, avec la police configurée"""
+    import cv_engine
+
+    data = parse_csv(synthetic_csv(*SIZES[size]))
+    styles = cv_engine.get_styles(theme)
+    result = {'size': size, 'font': cv_engine.THEMES[theme]['font']}
+    for label, compression in (('uncompressed', False), ('compressed', True)):
+        buffer = io.BytesIO()
+        cv_engine.write_pdf(cv_engine.build_story(data, styles), buffer, theme, compression=compression)
+        result[label] = buffer.tell()
+    result['ratio'] = round(result['uncompressed'] / result['compressed'], 2)
+    return result
+
+
+def count_pages(pdf_bytes):
+    """Nombre de pages d'un PDF produit par ReportLab"""
+    return len(re.findall(rb'/Type /Page\b(?!s)', pdf_bytes))
+
+
+def bench_pages(max_pages, iterations, theme='default', bullets=6):
+    """
+    Durée de mise en page d'un CV synthétique de 1 à max_pages pages
+
+    Une expérience est ajoutée à chaque pas jusqu'à atteindre max_pages ; si
+    la pagination est linéaire, le temps par page reste à peu près constant.
+    Rendus à froid (cache de paragraphes vidé) : la mise en page est refaite
+    en entier.
+    """
+    import cv_engine
+
+    styles = cv_engine.get_styles(theme)
+    results = []
+    experiences = 0
+    pages = 0
+    while pages < max_pages:
+        experiences += 1
+        data = parse_csv(synthetic_csv(experiences, bullets))
+        timings = []
+        for _ in range(iterations):
+            cv_engine.paragraph_cache.clear()
+            story = cv_engine.build_story(data, styles)
+            buffer = io.BytesIO()
+            t0 = time.perf_counter()
+            cv_engine.write_pdf(story, buffer, theme)
+            timings.append(time.perf_counter() - t0)
+        page_count = count_pages(buffer.getvalue())
+        if page_count == pages:
+            continue
+        pages = page_count
+        layout_ms = percentile(timings, 50) * 1000
+        results.append({
+            'pages': pages,
+            'experiences': experiences,
+            'layout_p50_ms': round(layout_ms, 2),
+            'ms_per_page': round(layout_ms / pages, 2),
+        })
+    return results
+
+
+def bench_api(size, requests_count, concurrency):
+    """Mesure /generate-cv de bout en bout (client de test Flask, cache désactivé)"""
+    import cv_api
+
+    cv_api.app.config['CACHE_ENABLED'] = False
+    csv_content = synthetic_csv(*SIZES[size])
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    counter = iter(range(requests_count))
+
+    def worker():
+        client = cv_api.app.test_client()
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            t0 = time.perf_counter()
+            response = client.post('/generate-cv', json={'csv_content': csv_content})
+            elapsed = time.perf_counter() - t0
+            with lock:
+                latencies.append(elapsed)
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    return {
+        'size': size,
+        'requests': requests_count,
+        'concurrency': concurrency,
+        'errors': len(errors),
+        'throughput_rps': round(requests_count / wall, 1),
+        'latency': summarize(latencies),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def print_stages(result):
+    cold = result['stages']
+    warm = result['stages_warm']
+    print(f"\n📏 {result['size']:<7} CSV {result['csv_bytes'] / 1024:.1f} Ko -> PDF {result['pdf_bytes'] / 1024:.1f} Ko"
+          f" | RSS max {result['peak_rss_mb']} Mo")
+    print(f"   {'':<8}{'à froid (ms)':>20}{'cache chaud (ms)':>20}")
+    print(f"   {'étape':<8}{'p50':>10}{'p99':>10}{'p50':>10}{'p99':>10}")
+    for stage in cold:
+        print(f"   {stage:<8}{cold[stage]['p50_ms']:>10}{cold[stage]['p99_ms']:>10}"
+              f"{warm[stage]['p50_ms']:>10}{warm[stage]['p99_ms']:>10}")
+
+
+def print_output_sizes(results):
+    import cv_engine
+
+    font = os.path.basename(cv_engine.FONT_PATH) if cv_engine.FONT_PATH else results[0]['font']
+    print(f"\n📦 Taille des PDF (police {font})")
+    print(f"   {'taille':<8}{'brut (Ko)':>12}{'compressé (Ko)':>16}{'gain':>8}")
+    for result in results:
+        print(f"   {result['size']:<8}{result['uncompressed'] / 1024:>12.1f}"
+              f"{result['compressed'] / 1024:>16.1f}{result['ratio']:>7}x")
+
+
+def print_pages(results):
+    print("\n📄 Pagination (mise en page seule)")
+    print(f"   {'pages':<7}{'expériences':>12}{'p50 (ms)':>10}{'ms/page':>10}")
+    for result in results:
+        print(f"   {result['pages']:<7}{result['experiences']:>12}"
+              f"{result['layout_p50_ms']:>10}{result['ms_per_page']:>10}")
+
+
+def print_api(result):
+    latency = result['latency']
+    print(f"\n🌐 API /generate-cv ({result['size']}) : {result['requests']} requêtes,"
+          f" concurrence {result['concurrency']}, {result['errors']} erreurs")
+    print(f"   {result['throughput_rps']} req/s | p50 {latency['p50_ms']} ms | p99 {latency['p99_ms']} ms"
+          f" | RSS max {result['peak_rss_mb']} Mo")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du générateur de CV")
+    parser.add_argument('--sizes', default=','.join(SIZES),
+                        help=f"tailles à mesurer parmi {', '.join(SIZES)}")
+    parser.add_argument('-n', '--iterations', type=int, default=20, help="itérations par taille")
+    parser.add_argument('--pages', type=int, default=10,
+                        help="nombre de pages du plus long CV de la mesure de pagination (0 : ignorer)")
+    parser.add_argument('--api-size', default='medium', help="taille des CV envoyés à l'API")
+    parser.add_argument('--api-requests', type=int, default=50, help="nombre de requêtes API")
+    parser.add_argument('--concurrency', type=int, default=4, help="requêtes API simultanées")
+    parser.add_argument('--no-api', action='store_true', help="ne pas mesurer l'API")
+    parser.add_argument('--json', action='store_true', help="afficher les résultats en JSON")
+    args = parser.parse_args(argv)
+
+    sizes = [size.strip() for size in args.sizes.split(',') if size.strip()]
+    unknown = [size for size in sizes + [args.api_size] if size not in SIZES]
+    if unknown:
+        parser.error(f"taille inconnue: {', '.join(unknown)}")
+
+    results = {'stages': [], 'output_bytes': [], 'pages': [], 'api': None}
+    for size in sizes:
+        result = bench_stages(size, args.iterations)
+        results['stages'].append(result)
+        if not args.json:
+            print_stages(result)
+
+    results['output_bytes'] = [bench_output_size(size) for size in sizes]
+    if not args.json:
+        print_output_sizes(results['output_bytes'])
+
+    if args.pages > 0:
+        results['pages'] = bench_pages(args.pages, max(1, args.iterations // 4))
+        if not args.json:
+            print_pages(results['pages'])
+
+    if not args.no_api:
+        results['api'] = bench_api(args.api_size, args.api_requests, args.concurrency)
+        if not args.json:
+            print_api(results['api'])
+
+    import cv_engine
+    results['paragraph_cache'] = cv_engine.paragraph_cache.as_dict()
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        cache = results['paragraph_cache']
+        print(f"\n🧩 Cache de paragraphes : parse {cache['parse_hit_ratio']} | lignes {cache['wrap_hit_ratio']}"
+              f" (taux de succès, {cache['entries']} entrées)")
+
+
+if __name__ == '__main__':
+    main()
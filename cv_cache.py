@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Cache adressé par contenu pour les CV générés
+
+La clé d'un CV est un hash de sa représentation normalisée (modèle CVData :
+commentaires exclus, éléments groupés et triés) et de la version du template :
+deux CSV équivalents produisent donc le même identifiant et le même PDF.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows : regroupement entre threads seulement
+    fcntl = None
+
+
+def cache_key(data, template_version):
+    """Calcule la clé de cache (sha256 hexadécimal) d'un CV parsé (CVData)"""
+    payload = json.dumps(
+        [template_version, data.canonical()],
+        ensure_ascii=False,
+        separators=(',', ':')
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cv_id_for_key(key):
+    """Dérive un identifiant au format UUID à partir d'une clé de cache"""
+    return str(uuid.UUID(hex=key[:32]))
+
+
+def touch(path):
+    """Met à jour la date de modification d'un fichier (utilisée pour l'éviction LRU)"""
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def sweep_folder(folder, max_bytes, max_age, suffix='.pdf', now=None):
+    """
+    Supprime les fichiers trop anciens puis les moins récemment utilisés
+    jusqu'à repasser sous max_bytes. Retourne (fichiers supprimés, octets conservés).
+    """
+    now = time.time() if now is None else now
+    entries = []
+    with os.scandir(folder) as it:
+        for entry in it:
+            if not entry.name.endswith(suffix):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+
+    # Les plus récents d'abord : ce sont eux qu'on garde
+    entries.sort(reverse=True)
+
+    removed = 0
+    total = 0
+    for mtime, size, path in entries:
+        if now - mtime > max_age or total + size > max_bytes:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        else:
+            total += size
+    return removed, total
+
+
+class SingleFlight:
+    """
+    Regroupe les rendus simultanés d'un même CV (single-flight)
+
+    Le premier appelant pour une clé rend le CV ; les appelants suivants
+    attendent qu'il ait terminé, puis retrouvent le PDF dans le stockage au
+    lieu de le rendre à nouveau. Entre threads : un verrou par clé. Entre
+    processus (workers gunicorn) : un fichier verrou (flock) par clé dans
+    lock_folder. Au-delà de timeout secondes d'attente, l'appelant rend le CV
+    lui-même.
+    """
+
+    def __init__(self, lock_folder=None, timeout=60):
+        self.lock_folder = lock_folder if fcntl is not None else None
+        self.timeout = timeout
+        self._locks = {}  # clé -> [verrou, nombre d'appelants]
+        self._mutex = threading.Lock()
+        self._counters = {'leaders': 0, 'waited': 0, 'coalesced': 0, 'timeouts': 0}
+        if self.lock_folder:
+            os.makedirs(self.lock_folder, exist_ok=True)
+
+    def incr(self, counter):
+        with self._mutex:
+            self._counters[counter] += 1
+
+    def as_dict(self):
+        with self._mutex:
+            return dict(self._counters, in_flight=len(self._locks))
+
+    @contextmanager
+    def hold(self, key):
+        """
+        Détient la clé le temps du bloc ; produit True si un autre appelant
+        la détenait (le PDF a alors pu être produit entre-temps)
+        """
+        deadline = time.monotonic() + self.timeout
+        with self._mutex:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        lock = entry[0]
+        file_lock = None
+        waited = not lock.acquire(blocking=False)
+        thread_locked = not waited or lock.acquire(timeout=self.timeout)
+        try:
+            locked = thread_locked
+            if locked and self.lock_folder:
+                file_lock, waited_file = self._lock_file(key, deadline)
+                waited = waited or waited_file
+                locked = file_lock is not None
+            self.incr('waited' if waited else 'leaders')
+            if not locked:
+                self.incr('timeouts')
+            yield waited
+        finally:
+            if file_lock is not None:
+                self._unlock_file(*file_lock)
+            if thread_locked:
+                lock.release()
+            with self._mutex:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+    def _lock_file(self, key, deadline):
+        """Verrou exclusif sur lock_folder/<clé>.lock ; retourne ((fd, chemin) ou None, attente)"""
+        path = os.path.join(self.lock_folder, f"{key}.lock")
+        delay = 0.005
+        waited = False
+        while True:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                waited = True
+                if time.monotonic() >= deadline:
+                    return None, waited
+                time.sleep(delay)
+                delay = min(delay * 2, 0.1)
+                continue
+            # Le détenteur précédent a pu supprimer le fichier entre open() et flock()
+            try:
+                current = os.stat(path).st_ino == os.fstat(fd).st_ino
+            except FileNotFoundError:
+                current = False
+            if current:
+                return (fd, path), waited
+            os.close(fd)
+
+    @staticmethod
+    def _unlock_file(fd, path):
+        # Suppression avant libération : un fichier verrou n'est jamais supprimé par un non-détenteur
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        os.close(fd)
@@ -0,0 +1,984 @@
+#!/usr/bin/env python3
+"""
+Moteur de rendu des CV (partagé par le CLI cv_template.py et l'API cv_api.py)
+
+Usage:
+    from cv_model import parse_csv
+    from cv_engine import render
+
+    render(parse_csv(csv_content), 'cv.pdf')      # fichier
+    render(parse_csv(csv_content), buffer)        # ou tout flux binaire (io.BytesIO...)
+
+Ce module importe ReportLab : l'API ne le charge qu'au premier rendu.
+"""
+
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import partial
+from types import MappingProxyType
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import BaseDocTemplate, Paragraph, Spacer, Frame, PageTemplate, FrameBreak
+from reportlab.lib.enums import TA_CENTER
+from reportlab import rl_config
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from cv_model import CVData, Header, Experience, Formation
+
+# Configuration des couleurs
+DARK_BLUE = colors.HexColor('#1e3a5f')
+ACCENT_BLUE = colors.HexColor('#2980b9')
+TEXT_GRAY = colors.HexColor('#333333')
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+LEFT_COLUMN_WIDTH = 7*cm
+MARGIN = 1.5*cm
+
+# Colonnes de la page : x, y, largeur, hauteur, marges internes (gauche, droite, haut, bas)
+SIDEBAR_FRAME = (0, 0, LEFT_COLUMN_WIDTH, PAGE_HEIGHT, 10, 10, 10, 10)
+MAIN_FRAME = (LEFT_COLUMN_WIDTH, 0, PAGE_WIDTH - LEFT_COLUMN_WIDTH, PAGE_HEIGHT, MARGIN, MARGIN, MARGIN, MARGIN)
+
+# Pages suivantes : un bandeau étroit à la couleur de la sidebar, puis le contenu principal
+STRIP_WIDTH = 0.6*cm
+CONTINUATION_FRAME = (STRIP_WIDTH, 0, PAGE_WIDTH - STRIP_WIDTH, PAGE_HEIGHT, MARGIN, MARGIN, MARGIN, MARGIN)
+
+# FrameBreak est une instance (FrameBreak() en crée une copie) : sa classe sert aux tests
+_FrameBreak = type(FrameBreak)
+
+# Mise en page directe des CV d'une page (sans la négociation platypus) ; 0 : toujours platypus
+FAST_LAYOUT = os.environ.get('CV_FAST_LAYOUT', '1') != '0'
+
+# Compression des flux de pages (zlib, défaut de ReportLab, fixé ici explicitement) ; 0 pour déboguer
+PDF_COMPRESSION = os.environ.get('CV_PDF_COMPRESSION', '1') != '0'
+
+# Police TrueType embarquée à la place d'Helvetica (couverture Unicode, symboles, emoji
+# monochromes). Seul le sous-ensemble des glyphes utilisés est inclus dans chaque PDF.
+FONT_PATH = os.environ.get('CV_FONT_PATH')
+FONT_BOLD_PATH = os.environ.get('CV_FONT_BOLD_PATH') or FONT_PATH
+FONT_ITALIC_PATH = os.environ.get('CV_FONT_ITALIC_PATH') or FONT_PATH
+TTF_FAMILY = 'CVSans'
+
+# Version du template : à incrémenter à chaque modification des styles ou de la mise en page
+# (elle fait partie de la clé de cache, les anciens PDF ne sont donc plus servis).
+# Les options de rendu changent aussi les octets produits : elles y sont ajoutées.
+def font_fingerprint():
+    """
+    Empreinte courte des trois fichiers de police (chemins résolus, taille, date de
+    modification) : remplacer un fichier, même sous le même nom, change la version
+    """
+    digest = hashlib.sha256()
+    for path in (FONT_PATH, FONT_BOLD_PATH, FONT_ITALIC_PATH):
+        path = os.path.realpath(path)
+        try:
+            st = os.stat(path)
+            digest.update(f"{path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode('utf-8'))
+        except FileNotFoundError:
+            # register_fonts signalera l'erreur au premier rendu
+            digest.update(f"{path}\0missing\n".encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+TEMPLATE_VERSION = '2'
+if not PDF_COMPRESSION:
+    TEMPLATE_VERSION += '-raw'
+if FONT_PATH:
+    TEMPLATE_VERSION += f"-{os.path.splitext(os.path.basename(FONT_PATH))[0]}-{font_fingerprint()}"
+
+# Thèmes disponibles (couleurs et polices) ; chaque thème a sa feuille de styles mémoïsée
+THEMES = {
+    'default': {
+        'primary_color': DARK_BLUE,
+        'text_color': TEXT_GRAY,
+        'muted_color': colors.HexColor('#666666'),
+        'sidebar_color': DARK_BLUE,
+        'sidebar_title_color': colors.white,
+        'sidebar_text_color': colors.HexColor('#ecf0f1'),
+        'font': 'Helvetica',
+        'font_bold': 'Helvetica-Bold',
+        'font_italic': 'Helvetica-Oblique',
+    },
+}
+if FONT_PATH:
+    THEMES['default'].update(
+        font=TTF_FAMILY,
+        font_bold=f'{TTF_FAMILY}-Bold',
+        font_italic=f'{TTF_FAMILY}-Italic',
+    )
+
+# Nombre de couples (texte, style) gardés dans le cache de paragraphes (0 : désactivé)
+PARAGRAPH_CACHE_SIZE = int(os.environ.get('CV_PARAGRAPH_CACHE_SIZE', 4096))
+
+_style_registry = {}
+_style_lock = threading.Lock()
+_page_templates = threading.local()
+_fonts_registered = False
+
+
+def register_fonts():
+    """
+    Enregistre la police TrueType (CV_FONT_PATH) auprès de ReportLab
+
+    Une seule fois par processus : le fichier est lu et analysé ici, puis
+    chaque PDF n'embarque que le sous-ensemble des glyphes qu'il utilise.
+    La famille est déclarée pour que <b> et <i> choisissent les bonnes variantes.
+    """
+    global _fonts_registered
+    if _fonts_registered or not FONT_PATH:
+        return
+    fonts = {
+        TTF_FAMILY: FONT_PATH,
+        f'{TTF_FAMILY}-Bold': FONT_BOLD_PATH,
+        f'{TTF_FAMILY}-Italic': FONT_ITALIC_PATH,
+    }
+    for name, path in fonts.items():
+        if not os.path.isfile(path):
+            raise ValueError(f"Police introuvable: {path}")
+        pdfmetrics.registerFont(TTFont(name, path))
+    pdfmetrics.registerFontFamily(
+        TTF_FAMILY,
+        normal=TTF_FAMILY,
+        bold=f'{TTF_FAMILY}-Bold',
+        italic=f'{TTF_FAMILY}-Italic',
+        boldItalic=f'{TTF_FAMILY}-Bold',
+    )
+    _fonts_registered = True
+
+
+def create_styles(theme='default'):
+    """Crée tous les styles nécessaires pour le CV"""
+    t = THEMES[theme]
+    styles = getSampleStyleSheet()
+    
+    # Styles sidebar
+    styles.add(ParagraphStyle(
+        name='SidebarName',
+        parent=styles['Normal'],
+        fontSize=18,
+        textColor=t['sidebar_title_color'],
+        spaceAfter=4,
+        fontName=t['font_bold'],
+        alignment=TA_CENTER
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='SidebarTitle',
+        parent=styles['Normal'],
+        fontSize=13,
+        textColor=t['sidebar_text_color'],
+        spaceAfter=12,
+        fontName=t['font'],
+        alignment=TA_CENTER
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='SidebarSection',
+        parent=styles['Normal'],
+        fontSize=11,
+        textColor=t['sidebar_title_color'],
+        spaceBefore=10,
+        spaceAfter=6,
+        fontName=t['font_bold'],
+        leftIndent=5
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='SidebarText',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=t['sidebar_text_color'],
+        spaceAfter=4,
+        leading=11,
+        fontName=t['font'],
+        leftIndent=5
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='SidebarBullet',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=t['sidebar_text_color'],
+        spaceAfter=3,
+        leading=11,
+        fontName=t['font'],
+        leftIndent=10,
+        bulletIndent=5
+    ))
+    
+    # Styles main content
+    styles.add(ParagraphStyle(
+        name='MainSection',
+        parent=styles['Heading2'],
+        fontSize=13,
+        textColor=t['primary_color'],
+        spaceBefore=10,
+        spaceAfter=6,
+        fontName=t['font_bold']
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='JobTitle',
+        parent=styles['Normal'],
+        fontSize=10.5,
+        textColor=t['primary_color'],
+        spaceBefore=5,
+        spaceAfter=2,
+        fontName=t['font_bold']
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='CompanyDate',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=t['muted_color'],
+        spaceAfter=3,
+        fontName=t['font_italic']
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='MainText',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=t['text_color'],
+        spaceAfter=3,
+        leading=11,
+        fontName=t['font']
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='MainBullet',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=t['text_color'],
+        leftIndent=12,
+        spaceAfter=2,
+        leading=11,
+        fontName=t['font']
+    ))
+    
+    return styles
+
+
+def get_styles(theme='default'):
+    """
+    Retourne la feuille de styles (immuable) d'un thème
+
+    Les styles sont construits une seule fois par processus et par thème,
+    puis partagés par toutes les requêtes.
+    """
+    styles = _style_registry.get(theme)
+    if styles is None:
+        with _style_lock:
+            styles = _style_registry.get(theme)
+            if styles is None:
+                if theme not in THEMES:
+                    raise ValueError(f"Thème inconnu: {theme}")
+                register_fonts()
+                styles = MappingProxyType(dict(create_styles(theme).byName))
+                _style_registry[theme] = styles
+    return styles
+
+
+def warm_styles():
+    """Pré-construit les styles de tous les thèmes (à appeler avant le fork des workers)"""
+    for theme in THEMES:
+        get_styles(theme)
+
+
+class WrapOnceParagraph(Paragraph):
+    """
+    Paragraph dont le découpage en lignes est mémorisé pour une largeur donnée
+
+    Un même objet peut ainsi être remis en page (rendu incrémental) sans que
+    ses lignes soient recalculées : wrap() ne dépend que de la largeur.
+    """
+
+    def wrap(self, availWidth, availHeight):
+        if getattr(self, '_wrap_width', None) == availWidth and hasattr(self, 'blPara'):
+            return self.width, self.height
+        size = Paragraph.wrap(self, availWidth, availHeight)
+        self._wrap_width = availWidth
+        return size
+
+
+class _ParsedText:
+    """Markup parsé d'un texte pour un style, et découpages en lignes par largeur"""
+    __slots__ = ('text', 'style', 'frags', 'bullet_text', 'wrapped')
+
+    def __init__(self, para):
+        self.text = para.text
+        self.style = para.style
+        self.frags = para.frags
+        self.bullet_text = para.bulletText
+        self.wrapped = {}  # largeur -> attributs posés par wrap()
+
+
+class CachedParagraph(WrapOnceParagraph):
+    """
+    Paragraph construit depuis le cache : markup déjà parsé, lignes déjà découpées
+
+    Les morceaux issus d'un split() (même classe, sans _parsed) sont découpés normalement.
+    """
+    _parsed = None
+
+    def wrap(self, availWidth, availHeight):
+        if self._parsed is None:
+            return WrapOnceParagraph.wrap(self, availWidth, availHeight)
+        if getattr(self, '_wrap_width', None) == availWidth and hasattr(self, 'blPara'):
+            return self.width, self.height
+        parsed = self._parsed
+        state = parsed.wrapped.get(availWidth)
+        if state is None:
+            paragraph_cache.incr('wrap_misses')
+            # Découpage sur un paragraphe neuf : seuls les attributs posés par wrap() (lignes,
+            # hauteur...) sont mémorisés ; ils ne dépendent que du texte, du style et de la largeur
+            probe = Paragraph(parsed.text, parsed.style, bulletText=parsed.bullet_text, frags=parsed.frags)
+            initial = dict(probe.__dict__)
+            probe.wrap(availWidth, availHeight)
+            state = {
+                name: value for name, value in probe.__dict__.items()
+                if initial.get(name, initial) is not value
+            }
+            if 'height' not in state:
+                # Largeur trop faible : rien n'a été découpé
+                return WrapOnceParagraph.wrap(self, availWidth, availHeight)
+            parsed.wrapped[availWidth] = state
+        else:
+            paragraph_cache.incr('wrap_hits')
+        self.__dict__.update(state)
+        self._wrap_width = availWidth
+        return self.width, self.height
+
+
+class ParagraphCache:
+    """
+    Cache LRU borné des paragraphes, partagé par tous les rendus du processus
+
+    Les mêmes textes reviennent d'un CV à l'autre (titres de section,
+    compétences, langues...) : pour un couple (texte, style), le markup n'est
+    parsé qu'une fois, et pour chaque largeur disponible les lignes ne sont
+    découpées qu'une fois.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (texte, style) -> _ParsedText
+        self._lock = threading.Lock()
+        self.parse_hits = self.parse_misses = 0
+        self.wrap_hits = self.wrap_misses = 0
+        self.evicted = 0
+
+    def incr(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def paragraph(self, text, style):
+        key = (text, style)
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is not None:
+                self._entries.move_to_end(key)
+                self.parse_hits += 1
+        if parsed is None:
+            parsed = _ParsedText(Paragraph(text, style))
+            with self._lock:
+                self.parse_misses += 1
+                parsed = self._entries.setdefault(key, parsed)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evicted += 1
+        para = CachedParagraph(parsed.text, parsed.style, bulletText=parsed.bullet_text, frags=parsed.frags)
+        para._parsed = parsed
+        return para
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def as_dict(self):
+        parses = self.parse_hits + self.parse_misses
+        wraps = self.wrap_hits + self.wrap_misses
+        return {
+            'parse_hits': self.parse_hits,
+            'parse_misses': self.parse_misses,
+            'parse_hit_ratio': round(self.parse_hits / parses, 4) if parses else None,
+            'wrap_hits': self.wrap_hits,
+            'wrap_misses': self.wrap_misses,
+            'wrap_hit_ratio': round(self.wrap_hits / wraps, 4) if wraps else None,
+            'entries': len(self._entries),
+            'evicted': self.evicted,
+        }
+
+
+paragraph_cache = ParagraphCache(PARAGRAPH_CACHE_SIZE)
+
+
+def paragraph(text, style):
+    """Crée un paragraphe du CV (markup parsé et découpage en lignes mis en cache)"""
+    if paragraph_cache.max_entries <= 0:
+        return WrapOnceParagraph(text, style)
+    return paragraph_cache.paragraph(text, style)
+
+
+def build_sidebar(data, styles):
+    """Construit le contenu de la colonne latérale"""
+    story = []
+    header = data.header
+    
+    story.append(Spacer(1, 1*cm))
+    if header.nom is not None:
+        story.append(paragraph(header.nom, styles['SidebarName']))
+    
+    if header.titre is not None:
+        story.append(paragraph(header.titre, styles['SidebarTitle']))
+    
+    story.append(Spacer(1, 0.5*cm))
+    
+    # Contact
+    story.append(paragraph("📧 Contact", styles['SidebarSection']))
+    for content in (header.email, header.telephone, header.localisation, header.remote):
+        if content is not None:
+            story.append(paragraph(content, styles['SidebarText']))
+    story.append(Spacer(1, 0.3*cm))
+    
+    # Réseaux sociaux
+    if header.twitter is not None or header.linkedin is not None:
+        story.append(paragraph("🌐 Réseaux sociaux", styles['SidebarSection']))
+        for content in (header.twitter, header.linkedin):
+            if content is not None:
+                story.append(paragraph(content, styles['SidebarText']))
+        story.append(Spacer(1, 0.3*cm))
+    
+    # Langues
+    if data.langues:
+        story.append(paragraph("🌍 Langues", styles['SidebarSection']))
+        for content in data.langues:
+            story.append(paragraph(content, styles['SidebarText']))
+        story.append(Spacer(1, 0.3*cm))
+    
+    # Compétences clés
+    if data.competences_cles:
+        story.append(paragraph("💡 Compétences clés", styles['SidebarSection']))
+        for content in data.competences_cles:
+            story.append(paragraph(f"• {content}", styles['SidebarBullet']))
+            story.append(Spacer(1, 0.2*cm))
+        story.append(Spacer(1, 0.3*cm))
+    
+    # Centres d'intérêt
+    if data.centres_interet:
+        story.append(paragraph("🎨 Centres d'intérêt", styles['SidebarSection']))
+        for content in data.centres_interet:
+            story.append(paragraph(content, styles['SidebarText']))
+    
+    return story
+
+
+def build_profil(profil, styles):
+    """Section profil (liste de descriptions vide : titre seul)"""
+    story = [paragraph("PROFIL", styles['MainSection'])]
+    for description in profil:
+        story.append(paragraph(description, styles['MainText']))
+    story.append(Spacer(1, 0.3*cm))
+    return story
+
+
+def build_experience(experience, styles):
+    """Bloc d'une expérience : titre, période, bullets"""
+    story = [paragraph(experience.titre, styles['JobTitle'])]
+    
+    if experience.periode is not None:
+        story.append(paragraph(experience.periode, styles['CompanyDate']))
+    
+    for bullet in experience.bullets:
+        story.append(paragraph(f"• {bullet}", styles['MainBullet']))
+    
+    story.append(Spacer(1, 0.2*cm))
+    return story
+
+
+def build_formations(formations, styles):
+    """Section diplômes et formations"""
+    story = [paragraph("DIPLÔMES ET FORMATIONS", styles['MainSection'])]
+    
+    for formation in formations:
+        story.append(paragraph(formation.titre, styles['JobTitle']))
+        
+        if formation.periode is not None:
+            story.append(paragraph(formation.periode, styles['CompanyDate']))
+        
+        if formation.description is not None:
+            story.append(paragraph(formation.description, styles['MainText']))
+        
+        story.append(Spacer(1, 0.15*cm))
+    return story
+
+
+def build_competences_tech(competences, styles):
+    """Section compétences techniques"""
+    story = [paragraph("COMPÉTENCES TECHNIQUES", styles['MainSection'])]
+    for content in competences:
+        story.append(paragraph(f"• {content}", styles['MainBullet']))
+    story.append(Spacer(1, 0.2*cm))
+    return story
+
+
+def main_blocks(data):
+    """
+    Découpe le contenu principal en blocs indépendants
+
+    Retourne une liste de (empreinte, constructeur) : l'empreinte identifie le
+    contenu du bloc (deux blocs de même empreinte produisent les mêmes
+    flowables), le constructeur prend la feuille de styles.
+    """
+    blocks = [(('top',), lambda styles: [Spacer(1, 0.5*cm)])]
+    
+    # Profil
+    if data.profil is not None:
+        blocks.append((('profil',) + tuple(data.profil), partial(build_profil, data.profil)))
+    
+    # Expériences professionnelles (déjà groupées et triées au parsing) : un bloc par expérience
+    if data.experiences is not None:
+        blocks.append((
+            ('experiences',),
+            lambda styles: [paragraph("EXPÉRIENCES PROFESSIONNELLES", styles['MainSection'])]
+        ))
+        for experience in data.experiences:
+            fingerprint = ('experience', experience.titre, experience.periode, tuple(experience.bullets))
+            blocks.append((fingerprint, partial(build_experience, experience)))
+    
+    # Formations
+    if data.formations is not None:
+        fingerprint = ('formations',) + tuple((f.titre, f.periode, f.description) for f in data.formations)
+        blocks.append((fingerprint, partial(build_formations, data.formations)))
+    
+    # Compétences techniques
+    if data.competences_tech:
+        fingerprint = ('competences_tech',) + tuple(data.competences_tech)
+        blocks.append((fingerprint, partial(build_competences_tech, data.competences_tech)))
+    
+    return blocks
+
+
+def story_blocks(data):
+    """Blocs du CV complet : sidebar, saut de colonne, contenu principal"""
+    header = data.header
+    sidebar = (
+        ('sidebar',)
+        + tuple(getattr(header, name) for name in header.__slots__)
+        + (tuple(data.langues), tuple(data.competences_cles), tuple(data.centres_interet))
+    )
+    return [
+        (sidebar, partial(build_sidebar, data)),
+        (('frame_break',), lambda styles: [FrameBreak()]),
+    ] + main_blocks(data)
+
+
+def create_frame(geometry):
+    """Crée une Frame ReportLab à partir d'une géométrie de colonne (SIDEBAR_FRAME, MAIN_FRAME)"""
+    x, y, width, height, left, right, top, bottom = geometry
+    return Frame(
+        x, y, width, height,
+        leftPadding=left, rightPadding=right, topPadding=top, bottomPadding=bottom,
+        showBoundary=0
+    )
+
+
+def draw_page_background(canvas, theme='default'):
+    """Peint le fond de la sidebar"""
+    canvas.saveState()
+    canvas.setFillColor(THEMES[theme]['sidebar_color'])
+    canvas.rect(0, 0, LEFT_COLUMN_WIDTH, PAGE_HEIGHT, fill=1, stroke=0)
+    canvas.restoreState()
+
+
+def draw_continuation_background(canvas, theme='default'):
+    """Peint le bandeau des pages suivantes"""
+    canvas.saveState()
+    canvas.setFillColor(THEMES[theme]['sidebar_color'])
+    canvas.rect(0, 0, STRIP_WIDTH, PAGE_HEIGHT, fill=1, stroke=0)
+    canvas.restoreState()
+
+
+def create_page_templates(theme='default'):
+    """
+    Crée les templates de page : première page à deux colonnes (sidebar +
+    contenu principal), puis pages suivantes avec le contenu principal seul
+    """
+    first = PageTemplate(
+        id='TwoColumn',
+        frames=[create_frame(SIDEBAR_FRAME), create_frame(MAIN_FRAME)],
+        onPage=lambda canvas, doc: draw_page_background(canvas, theme),
+        autoNextPageTemplate='Continuation'
+    )
+    continuation = PageTemplate(
+        id='Continuation',
+        frames=[create_frame(CONTINUATION_FRAME)],
+        onPage=lambda canvas, doc: draw_continuation_background(canvas, theme),
+        autoNextPageTemplate='Continuation'
+    )
+    return [first, continuation]
+
+
+def get_page_templates(theme='default'):
+    """
+    Retourne les templates de page du thème pour le thread courant
+
+    Les Frames ReportLab sont des objets à état (réinitialisés à chaque page) :
+    ils peuvent être réutilisés d'un document à l'autre, mais pas partagés
+    entre deux rendus simultanés, d'où un cache par thread.
+    """
+    templates = getattr(_page_templates, 'by_theme', None)
+    if templates is None:
+        templates = _page_templates.by_theme = {}
+    if theme not in templates:
+        templates[theme] = create_page_templates(theme)
+    return templates[theme]
+
+
+def build_story(data, styles):
+    """Construit la liste des flowables du CV : sidebar, saut de colonne, contenu principal"""
+    story = []
+    for _, build in story_blocks(data):
+        story.extend(build(styles))
+    return story
+
+
+class StoryCache:
+    """
+    Flowables des blocs d'un CV, conservés d'un rendu à l'autre (rendu incrémental)
+
+    Lors d'une itération sur un CV (même CSV, un bullet modifié), seuls les
+    blocs dont l'empreinte a changé sont reconstruits ; les autres réutilisent
+    leurs Paragraph déjà découpés en lignes. Seule la mise en page finale est
+    refaite. Les flowables ne sont pas partagés entre deux rendus simultanés :
+    les appelants sérialisent les rendus d'un même cache via lock.
+    """
+
+    def __init__(self, theme='default'):
+        self.theme = theme
+        self.lock = threading.Lock()
+        self._blocks = {}  # empreinte -> flowables
+        self.reused = 0
+        self.rebuilt = 0
+
+    def build_story(self, data, styles):
+        story = []
+        blocks = {}
+        reused = rebuilt = 0
+        for fingerprint, build in story_blocks(data):
+            flowables = self._blocks.get(fingerprint)
+            # Un bloc en double dans le même CV n'utilise pas deux fois les mêmes objets
+            if flowables is None or fingerprint in blocks:
+                flowables = build(styles)
+                rebuilt += 1
+            else:
+                # Marque laissée par ReportLab sur un flowable reporté à la colonne suivante :
+                # sur un flowable réutilisé, elle ferait échouer la mise en page
+                for flowable in flowables:
+                    flowable.__dict__.pop('_postponed', None)
+                reused += 1
+            blocks.setdefault(fingerprint, flowables)
+            story.extend(flowables)
+        # Les blocs absents de cette version sont oubliés
+        self._blocks = blocks
+        self.reused, self.rebuilt = reused, rebuilt
+        return story
+
+    def render(self, data, sink, timings=None):
+        """Comme render(), en réutilisant les blocs inchangés depuis le rendu précédent"""
+        t0 = time.perf_counter()
+        styles = get_styles(self.theme)
+        t1 = time.perf_counter()
+        story = self.build_story(data, styles)
+        t2 = time.perf_counter()
+        write_pdf(story, sink, self.theme)
+        if timings is not None:
+            timings['styles'] = t1 - t0
+            timings['story'] = t2 - t1
+            timings['layout'] = time.perf_counter() - t2
+
+    def render_bytes(self, data, timings=None):
+        buffer = io.BytesIO()
+        self.render(data, buffer, timings)
+        return buffer.getvalue()
+
+
+class ColumnCursor:
+    """
+    Position courante dans une colonne, avec les règles de placement de Frame
+
+    Équivalent sans état partagé d'une Frame platypus : add() et split()
+    suivent Frame.add et Frame.split (espaces avant/après, chevauchement des
+    espaces consécutifs), mais mémorisent les positions au lieu de dessiner.
+    """
+
+    __slots__ = ('x', 'y', 'min_y', 'width', 'at_top', 'prev_after')
+
+    def __init__(self, geometry):
+        x1, y1, width, height, left, right, top, bottom = geometry
+        self.x = x1 + left
+        self.y = y1 + height - top
+        self.min_y = y1 + bottom
+        self.width = width - left - right
+        self.at_top = True
+        self.prev_after = 0
+
+    def _space_before(self, flowable, transfer):
+        if self.at_top:
+            return 0
+        space = flowable.getSpaceBefore()
+        if rl_config.overlapAttachedSpace:
+            if transfer and (getattr(flowable, '_SPACETRANSFER', False) or getattr(flowable, '_ZEROSIZE', False)):
+                space = self.prev_after
+            space = max(space - self.prev_after, 0)
+        return space
+
+    def add(self, flowable):
+        """Place le flowable ; retourne (x, y, _sW), ou None s'il ne tient pas"""
+        space = self._space_before(flowable, transfer=True)
+        avail_height = self.y - self.min_y - space
+        if avail_height <= 0 and not getattr(flowable, '_ZEROSIZE', False):
+            return None
+        w, h = flowable.wrap(self.width, avail_height)
+        y = self.y - h - space
+        if y < self.min_y - rl_config._FUZZ:
+            return None
+        placement = (self.x, y, self.width - w)
+        after = flowable.getSpaceAfter()
+        y -= after
+        if rl_config.overlapAttachedSpace and not getattr(flowable, '_SPACETRANSFER', False):
+            self.prev_after = after
+        if y != self.y:
+            self.at_top = False
+        self.y = y
+        return placement
+
+    def split(self, flowable):
+        """Découpe le flowable pour la place restante ; retourne les morceaux ([] si impossible)"""
+        space = self._space_before(flowable, transfer=False)
+        avail_height = self.y - self.min_y - space
+        if avail_height <= 0 and not getattr(flowable, '_ZEROSIZE', False):
+            return []
+        return flowable.split(self.width, avail_height)
+
+
+def paginate(story):
+    """
+    Répartit le story sur les pages en une seule passe
+
+    Première page : sidebar puis contenu principal ; pages suivantes :
+    CONTINUATION_FRAME. Chaque flowable est placé une fois ; un paragraphe qui
+    déborde est découpé une fois par saut de colonne. Les règles sont celles
+    de doc.build. Retourne [(numéro de page, [(flowable, x, y, _sW)])], ou None
+    si le story contient des flowables non pris en charge ou ne peut pas être
+    mis en page (doc.build signalera alors l'erreur).
+    """
+    pending = deque(story)
+    frames = iter(((1, SIDEBAR_FRAME), (1, MAIN_FRAME)))
+    pages = []
+    cursor = None
+    postponed = set()
+    page_number = 0
+
+    def next_frame():
+        nonlocal cursor, page_number
+        number, geometry = next(frames, (page_number + 1, CONTINUATION_FRAME))
+        if number != page_number:
+            page_number = number
+            pages.append((number, []))
+        cursor = ColumnCursor(geometry)
+
+    while pending:
+        flowable = pending.popleft()
+        if cursor is None:
+            next_frame()
+        if isinstance(flowable, _FrameBreak):
+            if getattr(flowable, '_ix', None) is not None:
+                return None
+            cursor = None
+            continue
+        if not isinstance(flowable, (Paragraph, Spacer)) or flowable.getKeepWithNext():
+            return None
+        style = getattr(flowable, 'style', None)
+        if style is not None and (getattr(style, 'pageBreakBefore', 0) or getattr(style, 'frameBreakBefore', 0)):
+            return None
+
+        placement = cursor.add(flowable)
+        if placement is not None:
+            pages[-1][1].append((flowable,) + placement)
+            continue
+        pieces = cursor.split(flowable)
+        if pieces:
+            placement = cursor.add(pieces[0])
+            if placement is None:
+                return None
+            pages[-1][1].append((pieces[0],) + placement)
+            pending.extendleft(reversed(pieces[1:]))
+            continue
+        if id(flowable) in postponed:
+            return None
+        postponed.add(id(flowable))
+        pending.appendleft(flowable)
+        cursor = None
+    return pages
+
+
+def write_direct(story, sink, theme, compression):
+    """
+    Met en page le story (paginate) puis le dessine directement sur le canvas ;
+    retourne False si le story doit être confié à doc.build
+
+    Rien n'est écrit avant que toutes les positions soient connues. Le PDF
+    est identique octet pour octet à celui de doc.build ; seule la
+    négociation platypus (frames, événements du document) est évitée.
+    """
+    pages = paginate(story)
+    if pages is None:
+        return False
+
+    canvas = Canvas(sink, pagesize=A4, invariant=1, pageCompression=1 if compression else 0)
+    canvas.setAuthor(None)
+    canvas.setTitle(None)
+    canvas.setSubject(None)
+    canvas.setCreator(None)
+    canvas.setProducer(None)
+    canvas.setKeywords([])
+    for number, placements in pages:
+        if number == 1:
+            draw_page_background(canvas, theme)
+        else:
+            draw_continuation_background(canvas, theme)
+        for flowable, x, y, shrink in placements:
+            flowable.drawOn(canvas, x, y, _sW=shrink)
+            # Comme Frame.add : pas de référence au canvas gardée sur un flowable réutilisé
+            flowable.__dict__.pop('canv', None)
+        canvas.showPage()
+    canvas.save()
+    return True
+
+
+def write_pdf(story, sink, theme='default', compression=None):
+    """
+    Met en page les flowables et écrit le PDF
+
+    Le story est paginé en une passe puis dessiné directement (write_direct) ;
+    s'il contient des flowables que paginate ne gère pas, ReportLab met en
+    page avec doc.build. Page 1 : sidebar + contenu principal ; pages
+    suivantes : contenu principal seul, à côté d'un bandeau étroit.
+
+    Le rendu est déterministe (invariant) : mêmes données, mêmes octets. Un
+    cv_id dérivé du contenu identifie donc aussi le fichier (ETag, Range).
+
+    compression : compresser les flux de pages (par défaut PDF_COMPRESSION).
+    Les polices sont des objets uniques, référencés par toutes les pages.
+    """
+    if compression is None:
+        compression = PDF_COMPRESSION
+    if FAST_LAYOUT and write_direct(story, sink, theme, compression):
+        return
+    
+    # Créer le document
+    doc = BaseDocTemplate(
+        sink,
+        pagesize=A4,
+        leftMargin=0,
+        rightMargin=0,
+        topMargin=0,
+        bottomMargin=0,
+        invariant=1,
+        pageCompression=1 if compression else 0
+    )
+    
+    # Templates de page partagés par les rendus successifs du même thread
+    doc.addPageTemplates(get_page_templates(theme))
+    
+    # Générer le PDF
+    doc.build(story)
+
+
+def render(data, sink, theme='default', timings=None):
+    """
+    Génère le PDF d'un CV (modèle CVData)
+
+    sink : chemin du fichier PDF ou flux binaire ouvert en écriture
+    timings : dict optionnel, complété avec la durée (secondes) des étapes
+              'styles', 'story' et 'layout'
+    """
+    t0 = time.perf_counter()
+    styles = get_styles(theme)
+    t1 = time.perf_counter()
+    story = build_story(data, styles)
+    t2 = time.perf_counter()
+    write_pdf(story, sink, theme)
+    if timings is not None:
+        timings['styles'] = t1 - t0
+        timings['story'] = t2 - t1
+        timings['layout'] = time.perf_counter() - t2
+
+
+def render_bytes(data, theme='default', timings=None):
+    """Génère le PDF d'un CV en mémoire et retourne ses octets"""
+    buffer = io.BytesIO()
+    render(data, buffer, theme, timings)
+    return buffer.getvalue()
+
+
+def sample_cv():
+    """CV type utilisé pour le préchauffage : toutes les sections, markup inclus"""
+    return CVData(
+        header=Header(
+            nom='Jean DUPONT', titre='Ingénieur Data', email='jean.dupont@example.com',
+            telephone='+33 6 00 00 00 00', localisation='Lyon', remote='Remote',
+            twitter='@jeandupont', linkedin='jeandupont'
+        ),
+        profil=["Ingénieur Data avec une expérience en <b>NLP, LLM et RAG</b> : conception, "
+                "mise en production et accompagnement du changement."],
+        experiences=[
+            Experience('exp1', 1, 'Ingénieur IA - Entreprise', '2020 - 2024 | Lyon', [
+                "Déployé des modèles en production (<b>Python</b>, <i>Spark</i>)",
+                "Encadré une équipe pluridisciplinaire",
+            ]),
+        ],
+        formations=[
+            Formation('f1', 1, "Diplôme d'ingénieur", '2015 - 2018 | École', 'Informatique et IA.'),
+        ],
+        langues=['Français - Natif', 'Anglais - Courant'],
+        competences_cles=['<b>Stratégie Data</b>: gouvernance, feuille de route'],
+        centres_interet=['Vélo'],
+        competences_tech=['<b>LLM</b>: GPT, Mistral • Fine-tuning'],
+    )
+
+
+def warm_up():
+    """
+    Préchauffe le moteur : styles de tous les thèmes, puis rendu d'un CV type par thème
+
+    Charge les métriques de polices, les templates de page et les caches de
+    ReportLab et de ce module (dont les titres de section du cache de
+    paragraphes). Appelé avant le fork des workers (gunicorn --preload), ces
+    objets sont partagés en copy-on-write. Retourne les durées (secondes).
+    """
+    report = {}
+    data = sample_cv()
+
+    started = time.perf_counter()
+    warm_styles()
+    report['styles'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for theme in THEMES:
+        render_bytes(data, theme)
+    report['first_render'] = time.perf_counter() - started
+
+    # Second rendu, à chaud : ce que coûtera le premier CV d'un worker
+    started = time.perf_counter()
+    render_bytes(data)
+    report['warm_render'] = time.perf_counter() - started
+    return report
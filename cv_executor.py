@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Exécuteurs de rendu PDF
+
+- InlineExecutor : rend dans le processus courant (comportement historique)
+- ProcessPoolRenderExecutor : rend dans un pool de processus pré-démarrés,
+  avec un délai maximal par tâche et une isolation des plantages
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+
+class RenderTimeout(Exception):
+    """Levée quand un rendu dépasse le délai autorisé"""
+
+
+class RenderCrashed(Exception):
+    """Levée quand le processus de rendu s'est arrêté brutalement"""
+
+
+class InlineExecutor:
+    """Exécute le rendu directement dans le processus appelant (pas de délai maximal)"""
+
+    def run(self, fn, *args, timeout=None):
+        return fn(*args)
+
+    def warm(self):
+        pass
+
+    def shutdown(self):
+        pass
+
+
+class ProcessPoolRenderExecutor:
+    """
+    Exécute le rendu dans un ProcessPoolExecutor
+
+    Le pool est créé à la première utilisation dans chaque processus (jamais
+    dans le master gunicorn). Un rendu qui dépasse le délai ou fait planter
+    son processus entraîne le redémarrage du pool ; le worker web reste intact.
+
+    Après un plantage, le rendu fautif ne peut pas être distingué des autres
+    rendus en cours (tous échouent avec BrokenProcessPool) : chacun est relancé
+    une fois, seul dans un processus dédié. Les victimes collatérales aboutissent ;
+    un CSV qui fait planter le rendu à chaque fois n'arrête plus que son propre
+    processus et échoue avec RenderCrashed.
+    """
+
+    def __init__(self, max_workers=None, timeout=60, initializer=None, mp_context='fork'):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.initializer = initializer
+        self.mp_context = mp_context
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+        # Relances isolées simultanées (un processus chacune) limitées à la taille du pool
+        self._isolated_slots = threading.BoundedSemaphore(self.max_workers)
+
+    def _create_pool(self, max_workers):
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context(self.mp_context),
+            initializer=self.initializer
+        )
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = self._create_pool(self.max_workers)
+                self._pid = os.getpid()
+            return self._pool
+
+    def warm(self):
+        """Démarre tous les processus du pool et attend la fin de leur initialisation (initializer)"""
+        pool = self._get_pool()
+        for future in [pool.submit(os.getpid) for _ in range(self.max_workers)]:
+            future.result()
+
+    def _restart(self, pool):
+        with self._lock:
+            if self._pool is not pool:
+                return
+            self._terminate(pool)
+            self._pool = None
+
+    @staticmethod
+    def _terminate(pool):
+        # ProcessPoolExecutor ne permet pas d'interrompre une tâche : on arrête ses processus
+        for process in list(getattr(pool, '_processes', {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, fn, *args, timeout=None):
+        timeout = timeout or self.timeout
+        pool = self._get_pool()
+        try:
+            future = pool.submit(fn, *args)
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            self._restart(pool)
+            raise RenderTimeout(f"Le rendu a dépassé le délai de {timeout}s")
+        except BrokenProcessPool:
+            self._restart(pool)
+        return self._run_isolated(fn, args, timeout)
+
+    def _run_isolated(self, fn, args, timeout):
+        """Relance une tâche touchée par un plantage, seule dans un processus dédié"""
+        with self._isolated_slots:
+            pool = self._create_pool(1)
+            try:
+                return pool.submit(fn, *args).result(timeout=timeout)
+            except TimeoutError:
+                raise RenderTimeout(f"Le rendu a dépassé le délai de {timeout}s")
+            except BrokenProcessPool:
+                raise RenderCrashed("Le processus de rendu s'est arrêté brutalement")
+            finally:
+                self._terminate(pool)
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
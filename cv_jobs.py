@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+File de rendus asynchrones bornée
+
+Les jobs sont exécutés par un pool de threads de taille fixe. Leur état est
+écrit sur disque (un fichier JSON par job) pour pouvoir être consulté depuis
+n'importe quel worker gunicorn.
+"""
+
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+class QueueFull(Exception):
+    """Levée quand la file de jobs a atteint sa capacité maximale"""
+
+
+class JobQueue:
+    """File de jobs avec pool de workers borné et contre-pression"""
+
+    def __init__(self, state_folder, max_workers=2, max_pending=16):
+        self.state_folder = state_folder
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        os.makedirs(state_folder, exist_ok=True)
+
+    def _get_executor(self):
+        # Le pool est créé à la première utilisation, et recréé après un fork
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='cv-job'
+            )
+            self._pid = os.getpid()
+            self._pending = 0
+        return self._executor
+
+    def depth(self):
+        """Nombre de jobs en attente ou en cours dans ce processus"""
+        return self._pending
+
+    def submit(self, fn, *args):
+        """Planifie fn(*args) et retourne l'identifiant du job (QueueFull si la file est pleine)"""
+        with self._lock:
+            executor = self._get_executor()
+            if self._pending >= self.max_pending:
+                raise QueueFull(f"File de génération pleine ({self.max_pending} jobs)")
+            self._pending += 1
+
+        job_id = str(uuid.uuid4())
+        self._write(job_id, {
+            'job_id': job_id,
+            'status': 'queued',
+            'created_at': datetime.utcnow().isoformat()
+        })
+        try:
+            executor.submit(self._run, job_id, fn, args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        return job_id
+
+    def get(self, job_id):
+        """Retourne l'état d'un job (dict) ou None s'il est inconnu"""
+        try:
+            with open(self._path(job_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _run(self, job_id, fn, args):
+        state = self.get(job_id) or {'job_id': job_id}
+        state.update(status='running', started_at=datetime.utcnow().isoformat())
+        self._write(job_id, state)
+        try:
+            state.update(status='done', result=fn(*args))
+        except Exception as e:
+            state.update(status='failed', error=str(e))
+        finally:
+            state['finished_at'] = datetime.utcnow().isoformat()
+            self._write(job_id, state)
+            with self._lock:
+                self._pending -= 1
+
+    def _path(self, job_id):
+        return os.path.join(self.state_folder, f"{job_id}.json")
+
+    def _write(self, job_id, state):
+        path = self._path(job_id)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Métriques de l'API (format texte Prometheus)
+
+Les durées des étapes d'un rendu (décodage, parsing, styles, story, mise en
+page, écriture) sont agrégées dans un histogramme par étape. Les durées de la
+requête en cours sont aussi collectées par thread, pour l'en-tête Server-Timing.
+
+Les valeurs sont propres à chaque processus (un worker gunicorn = une série).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Étapes instrumentées, dans l'ordre du rendu
+STAGES = ('decode', 'parse', 'styles', 'story', 'layout', 'write')
+
+# Bornes des buckets (secondes)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+
+class Histogram:
+    """Histogramme cumulatif, avec un label optionnel (ex: stage)"""
+
+    def __init__(self, name, help_text, label=None, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = tuple(buckets) + (float('inf'),)
+        self._series = {}  # valeur du label -> [compteurs par bucket, somme, total]
+        self._lock = threading.Lock()
+
+    def observe(self, value, label_value=None):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted(self._series.items(), key=lambda item: str(item[0]))
+            series = [(key, list(counts), total, count) for key, (counts, total, count) in series]
+        for label_value, counts, total, count in series:
+            base = [(self.label, label_value)] if self.label else []
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(base + [('le', _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(base)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(base)} {count}")
+        return lines
+
+
+def gauge(name, help_text, value, metric_type='gauge'):
+    """Lignes d'une métrique à valeur unique (gauge ou counter)"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    if value is not None:
+        lines.append(f"{name} {_format_value(value)}")
+    return lines
+
+
+stage_seconds = Histogram(
+    'cv_stage_seconds',
+    "Durée des étapes de génération d'un CV",
+    label='stage'
+)
+
+_current = threading.local()
+
+
+def observe(stage, seconds):
+    """Enregistre la durée d'une étape (histogramme et requête en cours du thread)"""
+    stage_seconds.observe(seconds, stage)
+    timings = getattr(_current, 'timings', None)
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+def observe_all(timings):
+    """Enregistre un dict {étape: secondes} (ex: retourné par un processus de rendu)"""
+    for stage, seconds in timings.items():
+        observe(stage, seconds)
+
+
+@contextmanager
+def timed(stage):
+    """Mesure la durée du bloc comme étape stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - start)
+
+
+@contextmanager
+def collect():
+    """Collecte les durées d'étapes enregistrées par le thread courant ; produit le dict"""
+    previous = getattr(_current, 'timings', None)
+    _current.timings = timings = {}
+    try:
+        yield timings
+    finally:
+        _current.timings = previous
+
+
+def server_timing(timings):
+    """Valeur de l'en-tête Server-Timing (durées en millisecondes)"""
+    ordered = [stage for stage in STAGES if stage in timings]
+    ordered += [stage for stage in timings if stage not in STAGES]
+    return ', '.join(f"{stage};dur={timings[stage] * 1000:.2f}" for stage in ordered)
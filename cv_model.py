@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Modèle de données d'un CV et parsing du CSV
+
+Le CSV (colonnes: section, subsection, type, content, order) est converti en
+un objet CVData : les regroupements (expériences et formations par préfixe
+de sous-section) et les tris par ordre sont faits une seule fois, au parsing.
+Les constructeurs du PDF consomment directement ce modèle.
+
+Un CV peut aussi être fourni en JSON structuré (parse_json) : il est validé
+puis converti directement, sans passer par le CSV.
+"""
+
+import csv
+
+
+# Sections affichées sous forme de simple liste (triées par sous-section puis par ordre)
+LIST_SECTIONS = ('langues', 'competences_cles', 'centres_interet', 'competences_tech')
+
+# Sections dont les sous-sections sont groupées par préfixe : {prefixe}_{champ}
+GROUPED_SECTIONS = ('experience', 'formation')
+
+
+class Header:
+    """En-tête du CV (colonne latérale)"""
+    __slots__ = ('nom', 'titre', 'email', 'telephone', 'localisation', 'remote', 'twitter', 'linkedin')
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+
+class Experience:
+    """Expérience professionnelle"""
+    __slots__ = ('key', 'order', 'titre', 'periode', 'bullets')
+
+    def __init__(self, key, order, titre, periode=None, bullets=None):
+        self.key = key
+        self.order = order
+        self.titre = titre
+        self.periode = periode
+        self.bullets = bullets or []
+
+
+class Formation:
+    """Diplôme ou formation"""
+    __slots__ = ('key', 'order', 'titre', 'periode', 'description')
+
+    def __init__(self, key, order, titre, periode=None, description=None):
+        self.key = key
+        self.order = order
+        self.titre = titre
+        self.periode = periode
+        self.description = description
+
+
+class CVData:
+    """
+    CV parsé
+
+    - profil : None si la section est absente, sinon la liste des descriptions
+      affichées (vide : titre seul ; une description vide reste un paragraphe)
+    - langues, competences_cles, centres_interet, competences_tech : listes de textes
+      (vides si la section est absente)
+    - experiences, formations : listes triées d'Experience / Formation, None si
+      la section est absente (une liste vide affiche le titre de section seul)
+    """
+    __slots__ = ('header', 'profil', 'experiences', 'formations') + LIST_SECTIONS
+
+    def __init__(self, header=None, profil=None, experiences=None, formations=None, **lists):
+        self.header = header or Header()
+        self.profil = profil
+        self.experiences = experiences
+        self.formations = formations
+        for name in LIST_SECTIONS:
+            setattr(self, name, lists.get(name) or [])
+
+    def canonical(self):
+        """Représentation normalisée (sérialisable en JSON) utilisée pour la clé de cache"""
+        return [
+            [getattr(self.header, name) for name in Header.__slots__],
+            self.profil,
+            None if self.experiences is None else [[e.titre, e.periode, e.bullets] for e in self.experiences],
+            None if self.formations is None else [[f.titre, f.periode, f.description] for f in self.formations],
+        ] + [getattr(self, name) for name in LIST_SECTIONS]
+
+
+def iter_lines(text):
+    """Itère sur les lignes d'une chaîne (fins de ligne conservées) sans la copier"""
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find('\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end + 1]
+        start = end + 1
+
+
+def _first(items):
+    """Contenu du premier élément (plus petit ordre, puis ordre d'apparition)"""
+    return min(items)[2] if items else None
+
+
+def parse_rows(rows):
+    """Construit un CVData à partir de lignes CSV (dicts section/subsection/type/content/order)"""
+    header = {}
+    profil = None
+    lists = {name: [] for name in LIST_SECTIONS}
+    groups = {name: {} for name in GROUPED_SECTIONS}
+    present = set()
+
+    # Chaque élément est stocké sous la forme (order, seq, content) : trier ces
+    # tuples revient à trier par ordre en conservant l'ordre d'apparition
+    for seq, row in enumerate(rows):
+        # Ignorer les lignes de commentaires et les lignes vides
+        if row['section'].startswith('#') or not row['section'].strip():
+            continue
+
+        section = row['section'].strip()
+        subsection = row['subsection'].strip()
+        content = row['content'].strip()
+        order = int(row['order']) if row['order'].strip() else 0
+        item = (order, seq, content)
+
+        if section == 'header':
+            header.setdefault(subsection, []).append(item)
+        elif section == 'profil':
+            if profil is None:
+                profil = []
+            if subsection == 'description':
+                profil.append(item)
+        elif section in lists:
+            lists[section].append((subsection, order, seq, content))
+        elif section in groups:
+            present.add(section)
+            if '_' in subsection:
+                prefix, suffix = subsection.split('_', 1)
+                groups[section].setdefault(prefix, {}).setdefault(suffix, []).append(item)
+
+    experiences = [] if 'experience' in present else None
+    for prefix, fields in groups['experience'].items():
+        if 'titre' not in fields:
+            continue
+        bullets = []
+        for suffix, items in fields.items():
+            if suffix.startswith('bullet'):
+                bullets.extend(sorted(items))
+        bullets.sort(key=lambda x: x[0])
+        experiences.append(Experience(
+            prefix,
+            min(fields['titre'])[0],
+            _first(fields['titre']),
+            _first(fields.get('periode')),
+            [b[2] for b in bullets]
+        ))
+    if experiences:
+        experiences.sort(key=lambda e: e.order)
+
+    formations = [] if 'formation' in present else None
+    for prefix, fields in groups['formation'].items():
+        if 'titre' not in fields:
+            continue
+        formations.append(Formation(
+            prefix,
+            min(fields['titre'])[0],
+            _first(fields['titre']),
+            _first(fields.get('periode')),
+            _first(fields.get('description'))
+        ))
+    if formations:
+        formations.sort(key=lambda f: f.order)
+
+    return CVData(
+        header=Header(**{key: _first(items) for key, items in header.items() if key in Header.__slots__}),
+        profil=None if profil is None else ([_first(profil)] if profil else []),
+        experiences=experiences,
+        formations=formations,
+        **{name: [item[3] for item in sorted(items)] for name, items in lists.items()}
+    )
+
+
+def parse_csv(source):
+    """
+    Parse un CV au format CSV
+
+    source peut être une chaîne ou un flux texte (ex: fichier, upload enveloppé
+    dans un io.TextIOWrapper) : les lignes sont lues une à une, la mémoire
+    utilisée dépend de la taille d'une ligne et non de celle du document.
+    """
+    lines = iter_lines(source) if isinstance(source, str) else source
+    return parse_rows(csv.DictReader(lines))
+
+
+# Champs acceptés par parse_json pour chaque élément des listes structurées
+EXPERIENCE_FIELDS = ('titre', 'periode', 'bullets')
+FORMATION_FIELDS = ('titre', 'periode', 'description')
+JSON_SECTIONS = ('header', 'profil', 'experiences', 'formations') + LIST_SECTIONS
+
+
+def _check_object(value, path, fields):
+    if not isinstance(value, dict):
+        raise ValueError(f"'{path}' doit être un objet")
+    unknown = [key for key in value if key not in fields]
+    if unknown:
+        raise ValueError(f"Champ inconnu '{path}.{unknown[0]}' (champs acceptés: {', '.join(fields)})")
+    return value
+
+
+def _check_text(value, path, required=False):
+    """Texte nettoyé comme le contenu d'une ligne CSV ; None si absent et facultatif"""
+    if value is None:
+        if required:
+            raise ValueError(f"Le champ '{path}' est requis")
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"'{path}' doit être une chaîne")
+    return value.strip()
+
+
+def _check_texts(value, path):
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ValueError(f"'{path}' doit être une liste de chaînes")
+    return [_check_text(item, f"{path}[{i}]", required=True) for i, item in enumerate(value)]
+
+
+def _check_items(value, path):
+    """Liste d'objets ; None si la section est absente"""
+    if value is None:
+        return None
+    if not isinstance(value, list):
+        raise ValueError(f"'{path}' doit être une liste d'objets")
+    return value
+
+
+def _json_experience(item, index):
+    path = f"cv.experiences[{index}]"
+    _check_object(item, path, EXPERIENCE_FIELDS)
+    return Experience(
+        f"exp{index}",
+        index,
+        _check_text(item.get('titre'), f"{path}.titre", required=True),
+        _check_text(item.get('periode'), f"{path}.periode"),
+        _check_texts(item.get('bullets'), f"{path}.bullets")
+    )
+
+
+def _json_formation(item, index):
+    path = f"cv.formations[{index}]"
+    _check_object(item, path, FORMATION_FIELDS)
+    return Formation(
+        f"formation{index}",
+        index,
+        _check_text(item.get('titre'), f"{path}.titre", required=True),
+        _check_text(item.get('periode'), f"{path}.periode"),
+        _check_text(item.get('description'), f"{path}.description")
+    )
+
+
+def parse_json(document):
+    """
+    Construit un CVData à partir d'un CV structuré (dict issu du JSON)
+
+    {
+        "header": {"nom": "...", "titre": "...", "email": "...", ...},
+        "profil": "...",
+        "experiences": [{"titre": "...", "periode": "...", "bullets": ["..."]}],
+        "formations": [{"titre": "...", "periode": "...", "description": "..."}],
+        "competences_cles": ["..."], "competences_tech": ["..."],
+        "langues": ["..."], "centres_interet": ["..."]
+    }
+
+    Tous les champs sont facultatifs sauf le titre des expériences et des
+    formations ; les listes sont affichées dans l'ordre donné. Les règles
+    d'affichage sont celles du CSV (section absente ou vide) : un même CV
+    donne le même PDF, et le même cv_id, dans les deux formats. Lève
+    ValueError (message indiquant le champ fautif) si le document est invalide.
+    """
+    _check_object(document, 'cv', JSON_SECTIONS)
+    profil = _check_text(document.get('profil'), 'cv.profil')
+
+    header = document.get('header')
+    header = {} if header is None else _check_object(header, 'cv.header', Header.__slots__)
+    header = Header(**{name: _check_text(value, f"cv.header.{name}") for name, value in header.items()})
+
+    experiences = _check_items(document.get('experiences'), 'cv.experiences')
+    if experiences is not None:
+        experiences = [_json_experience(item, i) for i, item in enumerate(experiences)]
+
+    formations = _check_items(document.get('formations'), 'cv.formations')
+    if formations is not None:
+        formations = [_json_formation(item, i) for i, item in enumerate(formations)]
+
+    return CVData(
+        header=header,
+        profil=None if profil is None else [profil],
+        experiences=experiences,
+        formations=formations,
+        **{name: _check_texts(document.get(name), f"cv.{name}") for name in LIST_SECTIONS}
+    )
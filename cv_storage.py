@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Stockage des PDF générés
+
+- DiskBlobStore : un fichier par PDF, réparti dans des sous-dossiers
+- MemoryBlobStore : PDF gardés en mémoire, éviction LRU au-delà d'une taille
+  maximale (pour les systèmes de fichiers éphémères ou en lecture seule)
+
+Les deux backends exposent la même interface : put, get, open, touch, delete,
+sweep, ainsi que des compteurs (stats) de lectures réussies/manquées et d'évictions.
+"""
+
+import io
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from cv_cache import touch
+
+
+class StoreStats:
+    """Compteurs d'un stockage (succès/échecs de lecture, évictions)"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.puts = 0
+        self.expired = 0
+        self.evicted = 0
+        self.entries = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def incr(self, counter, value=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    def as_dict(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+            'puts': self.puts,
+            'expired': self.expired,
+            'evicted': self.evicted,
+            'entries': self.entries,
+            'bytes': self.bytes,
+        }
+
+
+class DiskBlobStore:
+    """
+    Stockage des PDF sur disque local
+
+    Les fichiers sont répartis dans des sous-dossiers (ab/cd/abcd...pdf) pour
+    garder des répertoires de taille raisonnable. La date d'accès est mise à
+    jour explicitement à chaque lecture : sweep() l'utilise pour l'éviction LRU.
+    """
+
+    def __init__(self, folder, shard_depth=2):
+        self.folder = folder
+        self.shard_depth = shard_depth
+        self.stats = StoreStats()
+        os.makedirs(folder, exist_ok=True)
+
+    def _path(self, name):
+        shards = [name[2 * i:2 * i + 2] for i in range(self.shard_depth)]
+        return os.path.join(self.folder, *shards, name)
+
+    def put(self, name, data):
+        # Écriture dans un fichier temporaire puis renommage atomique : une requête
+        # concurrente ne voit jamais un PDF partiellement écrit
+        path = self._path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.stats.incr('puts')
+
+    def get(self, name):
+        f = self.open(name)
+        if f is None:
+            return None
+        with f:
+            return f.read()
+
+    def open(self, name):
+        """Retourne un fichier binaire ouvert en lecture, ou None"""
+        path = self._path(name)
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            self.stats.incr('misses')
+            return None
+        self.stats.incr('hits')
+        touch(path)
+        return f
+
+    def touch(self, name):
+        """Marque l'entrée comme récemment utilisée ; False si elle n'existe pas"""
+        found = touch(self._path(name))
+        self.stats.incr('hits' if found else 'misses')
+        return found
+
+    def delete(self, name):
+        try:
+            os.remove(self._path(name))
+        except FileNotFoundError:
+            pass
+
+    def _scan(self, folder):
+        with os.scandir(folder) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        # Les sous-dossiers non-shards (jobs, ...) ne font pas partie du stockage
+                        if len(entry.name) == 2:
+                            yield from self._scan(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        st = entry.stat()
+                        yield max(st.st_atime, st.st_mtime), st.st_size, entry.path
+                except FileNotFoundError:
+                    continue
+
+    def sweep(self, max_bytes, max_age, now=None):
+        """
+        Supprime les entrées non lues depuis max_age secondes, puis les moins
+        récemment lues jusqu'à repasser sous max_bytes. Retourne le nombre
+        d'entrées supprimées.
+        """
+        now = time.time() if now is None else now
+        # Les plus récemment lus d'abord : ce sont eux qu'on garde
+        entries = sorted(self._scan(self.folder), reverse=True)
+
+        expired = evicted = 0
+        kept = total = 0
+        for last_access, size, path in entries:
+            if now - last_access > max_age or total + size > max_bytes:
+                try:
+                    # Relu juste avant la suppression : une entrée lue (ou réécrite) depuis
+                    # le parcours vient d'être servie, son cv_id va être téléchargé
+                    st = os.stat(path)
+                    if max(st.st_atime, st.st_mtime) > last_access:
+                        kept += 1
+                        total += st.st_size
+                        continue
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                if now - last_access > max_age:
+                    expired += 1
+                else:
+                    evicted += 1
+            else:
+                kept += 1
+                total += size
+
+        with self.stats._lock:
+            self.stats.expired += expired
+            self.stats.evicted += evicted
+            self.stats.entries = kept
+            self.stats.bytes = total
+        return expired + evicted
+
+
+class MemoryBlobStore:
+    """Stockage des PDF en mémoire avec éviction LRU (par processus)"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.stats = StoreStats()
+        self._entries = OrderedDict()  # name -> (data, last_access)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def put(self, name, data):
+        with self._lock:
+            if name in self._entries:
+                self._size -= len(self._entries.pop(name)[0])
+            self._entries[name] = (data, time.time())
+            self._size += len(data)
+            self._evict(self.max_bytes)
+            self._update_size_stats()
+        self.stats.incr('puts')
+
+    def get(self, name):
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                self.stats.incr('misses')
+                return None
+            self._entries[name] = (entry[0], time.time())
+            self._entries.move_to_end(name)
+        self.stats.incr('hits')
+        return entry[0]
+
+    def open(self, name):
+        data = self.get(name)
+        return io.BytesIO(data) if data is not None else None
+
+    def touch(self, name):
+        return self.get(name) is not None
+
+    def delete(self, name):
+        with self._lock:
+            entry = self._entries.pop(name, None)
+            if entry is not None:
+                self._size -= len(entry[0])
+            self._update_size_stats()
+
+    def _update_size_stats(self):
+        self.stats.entries = len(self._entries)
+        self.stats.bytes = self._size
+
+    def _evict(self, max_bytes):
+        # Les entrées les moins récemment utilisées sont en tête
+        removed = 0
+        while self._size > max_bytes and self._entries:
+            _, (data, _) = self._entries.popitem(last=False)
+            self._size -= len(data)
+            removed += 1
+        self.stats.incr('evicted', removed)
+        return removed
+
+    def sweep(self, max_bytes, max_age, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = [name for name, (_, last_access) in self._entries.items()
+                       if now - last_access > max_age]
+            for name in expired:
+                self._size -= len(self._entries.pop(name)[0])
+            self.stats.incr('expired', len(expired))
+            removed = len(expired) + self._evict(min(max_bytes, self.max_bytes))
+            self._update_size_stats()
+            return removed
@@ -5,413 +5,261 @@ Template réutilisable pour générer un CV professionnel à partir d'un fichier
 Usage:
     python cv_template.py cv_content.csv output.pdf
     
+Mode lot (tous les CV dans un seul processus Python, répartis sur N processus) :
+    python cv_template.py --bulk dossier_csv/ dossier_pdf/
+    python cv_template.py --bulk "profils/**/*.csv" dossier_pdf/ --workers 8
+    python cv_template.py --bulk manifest.jsonl dossier_pdf/ --skip hash
+    
 Le fichier CSV doit contenir les colonnes: section, subsection, type, content, order
+La mise en page et les styles sont définis dans cv_engine.py.
 """
 
-import csv
+import argparse
+import glob
+import json
+import os
 import sys
-from collections import defaultdict
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.units import cm
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Frame, PageTemplate, FrameBreak
-from reportlab.lib.enums import TA_CENTER
-
-# Configuration des couleurs
-DARK_BLUE = colors.HexColor('#1e3a5f')
-ACCENT_BLUE = colors.HexColor('#2980b9')
-TEXT_GRAY = colors.HexColor('#333333')
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from cv_model import parse_csv
+from cv_engine import render, warm_styles, TEMPLATE_VERSION
 
-PAGE_WIDTH, PAGE_HEIGHT = A4
-LEFT_COLUMN_WIDTH = 7*cm
-MARGIN = 1.5*cm
+# État du mode lot (clé de contenu de chaque PDF généré), dans le dossier de sortie
+BULK_STATE_FILE = '.cv_bulk_state.json'
 
 
 def load_cv_data(csv_file):
-    """Charge les données du CV depuis un fichier CSV"""
-    data = defaultdict(lambda: defaultdict(list))
-    
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Ignorer les lignes de commentaires
-            if row['section'].startswith('#'):
-                continue
-            
-            section = row['section'].strip()
-            subsection = row['subsection'].strip()
-            content_type = row['type'].strip()
-            content = row['content'].strip()
-            order = int(row['order']) if row['order'].strip() else 0
-            
-            data[section][subsection].append({
-                'type': content_type,
-                'content': content,
-                'order': order
-            })
-    
-    # Trier par ordre
-    for section in data:
-        for subsection in data[section]:
-            data[section][subsection].sort(key=lambda x: x['order'])
-    
-    return data
+    """Charge les données du CV depuis un fichier CSV (modèle CVData)"""
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        return parse_csv(f)
 
 
-def create_styles():
-    """Crée tous les styles nécessaires pour le CV"""
-    styles = getSampleStyleSheet()
-    
-    # Styles pour la sidebar (colonne gauche)
-    styles.add(ParagraphStyle(
-        name='SidebarName',
-        parent=styles['Normal'],
-        fontSize=18,
-        textColor=colors.white,
-        spaceAfter=4,
-        fontName='Helvetica-Bold',
-        alignment=TA_CENTER
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='SidebarTitle',
-        parent=styles['Normal'],
-        fontSize=13,
-        textColor=colors.HexColor('#ecf0f1'),
-        spaceAfter=12,
-        fontName='Helvetica',
-        alignment=TA_CENTER
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='SidebarSection',
-        parent=styles['Normal'],
-        fontSize=11,
-        textColor=colors.white,
-        spaceBefore=10,
-        spaceAfter=6,
-        fontName='Helvetica-Bold',
-        leftIndent=5
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='SidebarText',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=colors.HexColor('#ecf0f1'),
-        spaceAfter=4,
-        leading=11,
-        fontName='Helvetica',
-        leftIndent=5
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='SidebarBullet',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=colors.HexColor('#ecf0f1'),
-        spaceAfter=3,
-        leading=11,
-        fontName='Helvetica',
-        leftIndent=10,
-        bulletIndent=5
-    ))
-    
-    # Styles pour le contenu principal (colonne droite)
-    styles.add(ParagraphStyle(
-        name='MainSection',
-        parent=styles['Heading2'],
-        fontSize=13,
-        textColor=DARK_BLUE,
-        spaceBefore=10,
-        spaceAfter=6,
-        fontName='Helvetica-Bold'
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='JobTitle',
-        parent=styles['Normal'],
-        fontSize=10.5,
-        textColor=DARK_BLUE,
-        spaceBefore=5,
-        spaceAfter=2,
-        fontName='Helvetica-Bold'
-    ))
-    
-    styles.add(ParagraphStyle(
-        name='CompanyDate',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=colors.HexColor('#666666'),
-        spaceAfter=3,
-        fontName='Helvetica-Oblique'
-    ))
+def generate_cv(csv_file, output_file):
+    """Génère le CV PDF à partir du fichier CSV"""
     
-    styles.add(ParagraphStyle(
-        name='MainText',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=TEXT_GRAY,
-        spaceAfter=3,
-        leading=11,
-        fontName='Helvetica'
-    ))
+    # Charger les données
+    print(f"📖 Chargement des données depuis {csv_file}...")
+    data = load_cv_data(csv_file)
     
-    styles.add(ParagraphStyle(
-        name='MainBullet',
-        parent=styles['Normal'],
-        fontSize=9,
-        textColor=TEXT_GRAY,
-        leftIndent=12,
-        spaceAfter=2,
-        leading=11,
-        fontName='Helvetica'
-    ))
+    # Construire et générer le PDF (moteur partagé avec l'API)
+    print(f"📄 Génération du PDF: {output_file}...")
+    render(data, output_file)
     
-    return styles
+    print(f"✅ CV généré avec succès: {output_file}")
 
 
-def build_sidebar(data, styles):
-    """Construit le contenu de la colonne latérale"""
-    story = []
-    
-    # Nom et titre
-    story.append(Spacer(1, 1*cm))
-    if 'header' in data:
-        if 'nom' in data['header']:
-            nom = data['header']['nom'][0]['content']
-            story.append(Paragraph(nom, styles['SidebarName']))
-        
-        if 'titre' in data['header']:
-            titre = data['header']['titre'][0]['content']
-            story.append(Paragraph(titre, styles['SidebarTitle']))
-    
-    story.append(Spacer(1, 0.5*cm))
-    
-    # Contact
-    story.append(Paragraph("📧 Contact", styles['SidebarSection']))
-    if 'header' in data:
-        for key in ['email', 'telephone', 'localisation', 'remote']:
-            if key in data['header']:
-                content = data['header'][key][0]['content']
-                story.append(Paragraph(content, styles['SidebarText']))
-    story.append(Spacer(1, 0.3*cm))
-    
-    # Réseaux sociaux
-    if 'header' in data and ('twitter' in data['header'] or 'linkedin' in data['header']):
-        story.append(Paragraph("🌐 Réseaux sociaux", styles['SidebarSection']))
-        for key in ['twitter', 'linkedin']:
-            if key in data['header']:
-                content = data['header'][key][0]['content']
-                story.append(Paragraph(content, styles['SidebarText']))
-        story.append(Spacer(1, 0.3*cm))
-    
-    # Langues
-    if 'langues' in data:
-        story.append(Paragraph("🌍 Langues", styles['SidebarSection']))
-        for lang_key in sorted(data['langues'].keys()):
-            for item in data['langues'][lang_key]:
-                story.append(Paragraph(item['content'], styles['SidebarText']))
-        story.append(Spacer(1, 0.3*cm))
-    
-    # Compétences clés
-    if 'competences_cles' in data:
-        story.append(Paragraph("💡 Compétences clés", styles['SidebarSection']))
-        for comp_key in sorted(data['competences_cles'].keys()):
-            for item in data['competences_cles'][comp_key]:
-                story.append(Paragraph(f"• {item['content']}", styles['SidebarBullet']))
-                story.append(Spacer(1, 0.2*cm))
-        story.append(Spacer(1, 0.3*cm))
-    
-    # Centres d'intérêt
-    if 'centres_interet' in data:
-        story.append(Paragraph("🎨 Centres d'intérêt", styles['SidebarSection']))
-        for interet_key in sorted(data['centres_interet'].keys()):
-            for item in data['centres_interet'][interet_key]:
-                story.append(Paragraph(item['content'], styles['SidebarText']))
-    
-    return story
+def collect_entries(source, output_dir):
+    """
+    Liste les CV à générer : [{'id', 'csv', 'csv_content', 'output'}]
 
+    source peut être :
+    - un dossier : tous ses fichiers .csv
+    - un motif glob (ex: "profils/**/*.csv")
+    - un manifeste JSONL : une ligne JSON par CV avec "csv" (chemin, relatif au
+      manifeste) ou "csv_content" (contenu), et optionnellement "id" et "output"
+    """
+    if source.endswith('.jsonl'):
+        base = os.path.dirname(os.path.abspath(source))
+        entries = []
+        with open(source, encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                csv_file = item.get('csv') or item.get('csv_file')
+                if csv_file is not None:
+                    csv_file = os.path.join(base, csv_file)
+                elif 'csv_content' not in item:
+                    raise ValueError(f"{source}:{number}: 'csv' ou 'csv_content' requis")
+                entry_id = str(item.get('id') or (
+                    os.path.splitext(os.path.basename(csv_file))[0] if csv_file else f"cv_{number:05d}"
+                ))
+                entries.append({
+                    'id': entry_id,
+                    'csv': csv_file,
+                    'csv_content': item.get('csv_content'),
+                    'mtime': os.path.getmtime(source) if csv_file is None else None,
+                    'output': os.path.join(output_dir, item.get('output') or f"{entry_id}.pdf"),
+                })
+        return entries
+    
+    if os.path.isdir(source):
+        paths = sorted(glob.glob(os.path.join(glob.escape(source), '*.csv')))
+    else:
+        paths = sorted(glob.glob(source, recursive=True))
+    entries = []
+    for path in paths:
+        entry_id = os.path.splitext(os.path.basename(path))[0]
+        entries.append({
+            'id': entry_id,
+            'csv': path,
+            'csv_content': None,
+            'mtime': None,
+            'output': os.path.join(output_dir, f"{entry_id}.pdf"),
+        })
+    return entries
 
-def build_main_content(data, styles):
-    """Construit le contenu principal"""
-    story = []
-    
-    story.append(Spacer(1, 0.5*cm))
-    
-    # Profil
-    if 'profil' in data:
-        story.append(Paragraph("PROFIL", styles['MainSection']))
-        if 'description' in data['profil']:
-            profil_text = data['profil']['description'][0]['content']
-            story.append(Paragraph(profil_text, styles['MainText']))
-        story.append(Spacer(1, 0.3*cm))
-    
-    # Expériences professionnelles
-    if 'experience' in data:
-        story.append(Paragraph("EXPÉRIENCES PROFESSIONNELLES", styles['MainSection']))
-        
-        # Grouper les expériences par préfixe (iafluence_, appuy_, etc.)
-        experiences = defaultdict(dict)
-        for key in data['experience']:
-            # Extraire le préfixe (avant le _)
-            if '_' in key:
-                prefix, suffix = key.split('_', 1)
-                if suffix not in experiences[prefix]:
-                    experiences[prefix][suffix] = []
-                experiences[prefix][suffix].extend(data['experience'][key])
-        
-        # Trier les expériences par ordre
-        sorted_experiences = []
-        for prefix in experiences:
-            if 'titre' in experiences[prefix]:
-                order = experiences[prefix]['titre'][0]['order']
-                sorted_experiences.append((order, prefix, experiences[prefix]))
-        
-        sorted_experiences.sort(key=lambda x: x[0])
-        
-        # Afficher chaque expérience
-        for _, prefix, exp_data in sorted_experiences:
-            if 'titre' in exp_data:
-                titre = exp_data['titre'][0]['content']
-                story.append(Paragraph(titre, styles['JobTitle']))
-            
-            if 'periode' in exp_data:
-                periode = exp_data['periode'][0]['content']
-                story.append(Paragraph(periode, styles['CompanyDate']))
-            
-            # Bullets
-            bullets = []
-            for key in exp_data:
-                if key.startswith('bullet'):
-                    bullets.extend(exp_data[key])
-            
-            bullets.sort(key=lambda x: x['order'])
-            for bullet in bullets:
-                story.append(Paragraph(f"• {bullet['content']}", styles['MainBullet']))
-            
-            story.append(Spacer(1, 0.2*cm))
-    
-    # Formations
-    if 'formation' in data:
-        story.append(Paragraph("DIPLÔMES ET FORMATIONS", styles['MainSection']))
-        
-        # Grouper les formations par préfixe
-        formations = defaultdict(dict)
-        for key in data['formation']:
-            if '_' in key:
-                prefix, suffix = key.split('_', 1)
-                if suffix not in formations[prefix]:
-                    formations[prefix][suffix] = []
-                formations[prefix][suffix].extend(data['formation'][key])
-        
-        # Trier par ordre
-        sorted_formations = []
-        for prefix in formations:
-            if 'titre' in formations[prefix]:
-                order = formations[prefix]['titre'][0]['order']
-                sorted_formations.append((order, prefix, formations[prefix]))
+
+def is_up_to_date_mtime(entry):
+    """Le PDF existe et est plus récent que son CSV (ou que le manifeste)"""
+    try:
+        output_mtime = os.path.getmtime(entry['output'])
+    except FileNotFoundError:
+        return False
+    source_mtime = entry['mtime'] if entry['csv'] is None else os.path.getmtime(entry['csv'])
+    return output_mtime >= source_mtime
+
+
+def render_bulk_entry(entry, skip, previous_key):
+    """
+    Génère un CV du lot (dans un processus du pool)
+
+    Retourne (id, statut, durée, clé de contenu, erreur) ; statut vaut
+    'rendered', 'skipped' ou 'failed'.
+    """
+    # Import local : le mode simple (un seul CV) ne dépend pas de cv_cache.py
+    from cv_cache import cache_key
+
+    started = time.perf_counter()
+    try:
+        if skip == 'mtime' and is_up_to_date_mtime(entry):
+            return entry['id'], 'skipped', time.perf_counter() - started, previous_key, None
         
-        sorted_formations.sort(key=lambda x: x[0])
+        if entry['csv'] is not None:
+            data = load_cv_data(entry['csv'])
+        else:
+            data = parse_csv(entry['csv_content'])
+        key = cache_key(data, TEMPLATE_VERSION)
+        if skip == 'hash' and key == previous_key and os.path.exists(entry['output']):
+            return entry['id'], 'skipped', time.perf_counter() - started, key, None
         
-        # Afficher chaque formation
-        for _, prefix, form_data in sorted_formations:
-            if 'titre' in form_data:
-                titre = form_data['titre'][0]['content']
-                story.append(Paragraph(titre, styles['JobTitle']))
-            
-            if 'periode' in form_data:
-                periode = form_data['periode'][0]['content']
-                story.append(Paragraph(periode, styles['CompanyDate']))
-            
-            if 'description' in form_data:
-                description = form_data['description'][0]['content']
-                story.append(Paragraph(description, styles['MainText']))
-            
-            story.append(Spacer(1, 0.15*cm))
-    
-    # Compétences techniques (optionnel - page 2)
-    if 'competences_tech' in data:
-        story.append(Paragraph("COMPÉTENCES TECHNIQUES", styles['MainSection']))
-        for comp_key in sorted(data['competences_tech'].keys()):
-            for item in data['competences_tech'][comp_key]:
-                story.append(Paragraph(f"• {item['content']}", styles['MainBullet']))
-        story.append(Spacer(1, 0.2*cm))
-    
-    return story
+        # Écriture dans un fichier temporaire : un PDF interrompu n'est jamais pris pour à jour
+        os.makedirs(os.path.dirname(entry['output']) or '.', exist_ok=True)
+        tmp_path = f"{entry['output']}.{os.getpid()}.tmp"
+        try:
+            render(data, tmp_path)
+            os.replace(tmp_path, entry['output'])
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return entry['id'], 'rendered', time.perf_counter() - started, key, None
+    except Exception as e:
+        return entry['id'], 'failed', time.perf_counter() - started, previous_key, f"{type(e).__name__}: {e}"
 
 
-def generate_cv(csv_file, output_file):
-    """Génère le CV PDF à partir du fichier CSV"""
-    
-    # Charger les données
-    print(f"📖 Chargement des données depuis {csv_file}...")
-    data = load_cv_data(csv_file)
-    
-    # Créer les styles
-    styles = create_styles()
-    
-    # Créer le document
-    doc = SimpleDocTemplate(
-        output_file,
-        pagesize=A4,
-        leftMargin=0,
-        rightMargin=0,
-        topMargin=0,
-        bottomMargin=0
-    )
-    
-    # Définir les frames (colonnes)
-    sidebar_frame = Frame(
-        0, 0, LEFT_COLUMN_WIDTH, PAGE_HEIGHT,
-        leftPadding=10, rightPadding=10, topPadding=10, bottomPadding=10,
-        showBoundary=0
-    )
-    
-    main_frame = Frame(
-        LEFT_COLUMN_WIDTH, 0, PAGE_WIDTH - LEFT_COLUMN_WIDTH, PAGE_HEIGHT,
-        leftPadding=MARGIN, rightPadding=MARGIN, topPadding=MARGIN, bottomPadding=MARGIN,
-        showBoundary=0
-    )
-    
-    # Fonction pour dessiner le fond de la sidebar
-    def on_page(canvas, doc):
-        canvas.saveState()
-        canvas.setFillColor(DARK_BLUE)
-        canvas.rect(0, 0, LEFT_COLUMN_WIDTH, PAGE_HEIGHT, fill=1, stroke=0)
-        canvas.restoreState()
-    
-    # Créer le template de page
-    page_template = PageTemplate(
-        id='TwoColumn',
-        frames=[sidebar_frame, main_frame],
-        onPage=on_page
+def _percentile(values, p):
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered))) - 1))]
+
+
+def generate_bulk(source, output_dir, workers=None, skip='hash', summary_file=None):
+    """
+    Génère tous les CV d'un dossier, d'un motif glob ou d'un manifeste JSONL
+
+    Les CV sont répartis sur workers processus (ReportLab n'est chargé qu'une
+    fois, avant le fork). Les PDF à jour sont sautés : skip='mtime' (PDF plus
+    récent que le CSV), 'hash' (contenu et version du template inchangés
+    depuis le dernier lot) ou 'none'. Retourne le résumé (dict), aussi écrit
+    dans summary_file (par défaut bulk_summary.json dans output_dir).
+    """
+    started = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    entries = collect_entries(source, output_dir)
+    ids = [entry['id'] for entry in entries]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Identifiants de CV en double dans le lot (même nom de fichier ?)")
+    
+    state_path = os.path.join(output_dir, BULK_STATE_FILE)
+    try:
+        with open(state_path, encoding='utf-8') as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        state = {}
+    
+    workers = workers or os.cpu_count() or 1
+    print(f"📦 {len(entries)} CV à traiter avec {workers} processus (saut des PDF à jour: {skip})...")
+    
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_styles) as pool:
+        futures = [
+            pool.submit(render_bulk_entry, entry, skip, state.get(entry['id']))
+            for entry in entries
+        ]
+        for done, future in enumerate(futures, 1):
+            entry_id, status, seconds, key, error = future.result()
+            results.append((entry_id, status, seconds, error))
+            if key is not None:
+                state[entry_id] = key
+            if status == 'failed':
+                print(f"❌ {entry_id}: {error}")
+            if done % 500 == 0:
+                print(f"   {done}/{len(entries)}...")
+    
+    tmp_state = f"{state_path}.tmp"
+    with open(tmp_state, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    os.replace(tmp_state, state_path)
+    
+    rendered = [seconds for _, status, seconds, _ in results if status == 'rendered']
+    summary = {
+        'source': source,
+        'output_dir': output_dir,
+        'workers': workers,
+        'skip': skip,
+        'total': len(results),
+        'rendered': len(rendered),
+        'skipped': sum(1 for _, status, _, _ in results if status == 'skipped'),
+        'failed': sum(1 for _, status, _, _ in results if status == 'failed'),
+        'wall_seconds': round(time.perf_counter() - started, 3),
+        'render_seconds': {
+            'p50': round(_percentile(rendered, 50), 4),
+            'p99': round(_percentile(rendered, 99), 4),
+            'max': round(max(rendered), 4),
+            'sum': round(sum(rendered), 3),
+        } if rendered else None,
+        'slowest': [
+            {'id': entry_id, 'seconds': round(seconds, 4)}
+            for entry_id, status, seconds, _ in sorted(results, key=lambda r: r[2], reverse=True)[:10]
+            if status == 'rendered'
+        ],
+        'failures': [
+            {'id': entry_id, 'error': error}
+            for entry_id, status, _, error in results if status == 'failed'
+        ],
+    }
+    
+    summary_file = summary_file or os.path.join(output_dir, 'bulk_summary.json')
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    
+    print(f"✅ {summary['rendered']} générés, {summary['skipped']} à jour, {summary['failed']} en erreur"
+          f" en {summary['wall_seconds']}s (résumé: {summary_file})")
+    return summary
+
+
+def bulk_main(argv):
+    """Point d'entrée du mode lot (--bulk)"""
+    parser = argparse.ArgumentParser(
+        prog=f"{os.path.basename(sys.argv[0])} --bulk",
+        description="Génère en lot les CV d'un dossier, d'un motif glob ou d'un manifeste JSONL"
     )
-    
-    doc.addPageTemplates([page_template])
-    
-    # Construire le contenu
-    print("🔨 Construction du CV...")
-    story = []
-    
-    # Contenu de la sidebar
-    story.extend(build_sidebar(data, styles))
-    
-    # Passage au frame principal
-    story.append(FrameBreak())
-    
-    # Contenu principal
-    story.extend(build_main_content(data, styles))
-    
-    # Générer le PDF
-    print(f"📄 Génération du PDF: {output_file}...")
-    doc.build(story)
-    
-    print(f"✅ CV généré avec succès: {output_file}")
+    parser.add_argument('source', help="dossier de CSV, motif glob ou manifeste .jsonl")
+    parser.add_argument('output_dir', help="dossier des PDF générés")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="processus de rendu (défaut: nombre de cœurs)")
+    parser.add_argument('--skip', choices=('hash', 'mtime', 'none'), default='hash',
+                        help="saut des PDF à jour (défaut: hash)")
+    parser.add_argument('--summary', default=None, help="fichier JSON du résumé (défaut: OUTPUT_DIR/bulk_summary.json)")
+    args = parser.parse_args(argv)
+    
+    summary = generate_bulk(args.source, args.output_dir, args.workers, args.skip, args.summary)
+    sys.exit(1 if summary['failed'] else 0)
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--bulk':
+        bulk_main(sys.argv[2:])
+    
     # Arguments par défaut
     csv_file = "cv_content.csv"
     output_file = "cv_output.pdf"
@@ -431,6 +279,5 @@ if __name__ == "__main__":
         sys.exit(1)
     except Exception as e:
         print(f"❌ Erreur lors de la génération du CV: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)